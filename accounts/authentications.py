@@ -1,20 +1,78 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User as UserModel
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+
+USER_CACHE_KEY = 'auth:user:{}'
+
+
+def get_user(user_id):
+    return UserModel.objects.select_related(
+        'profile',
+    ).filter(pk=user_id).first()
+
+
+def get_cached_user(user_id):
+    if not settings.USER_CACHE:
+        return get_user(user_id)
+    key = USER_CACHE_KEY.format(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user(user_id)
+        if user is None:
+            return None
+        cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def users_by_email(email):
+    # Matches the LOWER(email) expression index from accounts migration 0005.
+    # The input is folded by the same database function: SQLite's LOWER()
+    # only folds ASCII, so str.lower() would miss non-ASCII capitals.
+    return UserModel.objects.alias(
+        email_lower=Lower('email'),
+    ).filter(
+        email_lower=Lower(Value(email)),
+    )
+
+
+def invalidate_cached_user(user_id):
+    # Deleting before commit would let a concurrent request cache the old row.
+    transaction.on_commit(
+        partial(cache.delete, USER_CACHE_KEY.format(user_id)),
+    )
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        if user and self.user_can_authenticate(user):
+            return user
+        return None
 
 
 class EmailBackend:
     def authenticate(self, request, username=None, password=None):
-        try:
-            user = UserModel.objects.get(email=username)
+        if not username or password is None:
+            return None
+
+        # Older rows may share an address, so try every candidate instead of
+        # failing the login with MultipleObjectsReturned.
+        users = users_by_email(username).order_by('pk')
+        for user in users:
             if user.check_password(password):
                 return user
-            return None
 
-        except UserModel.DoesNotExist:
-            return None
+        if not users:
+            # Run the hasher once so a missing email is not faster to reject.
+            UserModel().set_password(password)
+        return None
 
     def get_user(self, user_id):
-        try:
-            return UserModel.objects.get(pk=user_id)
-        
-        except UserModel.DoesNotExist:
-            return None
+        return get_cached_user(user_id)
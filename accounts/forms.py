@@ -1,8 +1,11 @@
 from django import forms
 from django.contrib.auth.models import User as UserModel
 from django.core.exceptions import ValidationError
+from django.contrib.auth.forms import PasswordResetForm
 from django.contrib.auth.views import PasswordResetView
 
+from . import tasks
+from .authentications import users_by_email
 from .models import(
     Profile as ProfileModel,
 )
@@ -10,6 +13,10 @@ from .models import(
 from utils.base_alerts import BaseAlert
 
 
+# Context entries send_password_reset() rebuilds from the user.
+PASSWORD_RESET_SECRETS = ('email', 'user', 'uid', 'token')
+
+
 class UserRegistrationForm(forms.Form):
     username = forms.CharField(
         widget=forms.TextInput(
@@ -57,7 +64,7 @@ class UserRegistrationForm(forms.Form):
 
     def clean_email(self):
         email = self.cleaned_data['email']
-        user = UserModel.objects.filter(email=email).exists()
+        user = users_by_email(email).exists()
         if user:
             raise ValidationError(BaseAlert.email_already_exist)
         return email
@@ -155,3 +162,30 @@ class UserProfileEditForm(forms.ModelForm):
                 },
             ),
         }
+
+
+class UserPasswordResetForm(PasswordResetForm):
+    def send_mail(
+        self,
+        subject_template_name,
+        email_template_name,
+        context,
+        from_email,
+        to_email,
+        html_email_template_name=None,
+    ):
+        # Task rows are kept when they fail and shown in the admin, so only
+        # the user id and the request details are queued; the worker makes
+        # the token and renders the link.
+        tasks.send_password_reset.delay(
+            context['user'].pk,
+            subject_template_name,
+            email_template_name,
+            from_email,
+            html_email_template_name,
+            {
+                key: value
+                for key, value in context.items()
+                if key not in PASSWORD_RESET_SECRETS
+            },
+        )
@@ -0,0 +1,122 @@
+from array import array
+from bisect import bisect_left
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import (
+    Relation as RelationModel,
+    Profile as ProfileModel,
+)
+
+
+FOLLOWING_KEY = 'graph:following:{}'
+
+
+def _ids(values):
+    # Sorted array of 64-bit ids: compact in the cache and searchable with
+    # bisect, so membership stays O(log n) for users following thousands.
+    return array('q', sorted(values))
+
+
+def _contains(ids, user_id):
+    index = bisect_left(ids, user_id)
+    return index < len(ids) and ids[index] == user_id
+
+
+def following_ids(user_id):
+    key = FOLLOWING_KEY.format(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = _ids(
+            RelationModel.objects.filter(
+                from_user=user_id,
+            ).values_list('to_user', flat=True)
+        )
+        cache.set(key, ids, settings.GRAPH_CACHE_TIMEOUT)
+    return ids
+
+
+def is_following(user_id, target_id):
+    return _contains(following_ids(user_id), target_id)
+
+
+def followed_among(user_id, target_ids):
+    ids = following_ids(user_id)
+    return {target_id for target_id in target_ids if _contains(ids, target_id)}
+
+
+def following_count(user_id):
+    return len(following_ids(user_id))
+
+
+def follower_count(user_id):
+    return ProfileModel.objects.filter(
+        user=user_id,
+    ).values_list('followers_count', flat=True).first() or 0
+
+
+def _invalidate_following(user_id):
+    # Editing the cached array in place is a get/modify/set that loses ids
+    # when two follows by the same user race, so the entry is dropped and
+    # the next read, on any worker, reloads it from the table.
+    cache.delete(FOLLOWING_KEY.format(user_id))
+
+
+def _change_edge(user_id, target_id, delta):
+    # Call inside the transaction that wrote the relation row. The stored
+    # count is updated in the same transaction and its new value returned;
+    # select_for_update() reads it back from the primary.
+    profiles = ProfileModel.objects.filter(user=target_id)
+    profiles.update(followers_count=F('followers_count') + delta)
+    # Applied after commit so a reload never sees the table before the edge
+    # is written.
+    transaction.on_commit(partial(_invalidate_following, user_id))
+    return profiles.select_for_update().values_list(
+        'followers_count',
+        flat=True,
+    ).first()
+
+
+def add_edge(user_id, target_id):
+    return _change_edge(user_id, target_id, 1)
+
+
+def remove_edge(user_id, target_id):
+    return _change_edge(user_id, target_id, -1)
+
+
+def rebuild(user_ids):
+    relations = RelationModel.objects.order_by()
+    following = {user_id: [] for user_id in user_ids}
+    for user_id, target_id in relations.filter(
+        from_user__in=user_ids,
+    ).values_list('from_user', 'to_user'):
+        following[user_id].append(target_id)
+    follower_counts = dict(
+        relations.filter(
+            to_user__in=user_ids,
+        ).values_list('to_user').annotate(Count('pk'))
+    )
+
+    profiles = []
+    for profile in ProfileModel.objects.filter(
+        user__in=user_ids,
+    ).only('pk', 'user', 'followers_count'):
+        total = follower_counts.get(profile.user_id, 0)
+        if profile.followers_count != total:
+            profile.followers_count = total
+            profiles.append(profile)
+    ProfileModel.objects.bulk_update(profiles, ('followers_count',))
+
+    cache.set_many(
+        {
+            FOLLOWING_KEY.format(user_id): _ids(target_ids)
+            for user_id, target_ids in following.items()
+        },
+        settings.GRAPH_CACHE_TIMEOUT,
+    )
+    return len(following)
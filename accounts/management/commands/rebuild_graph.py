@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User as UserModel
+
+from accounts import graph
+from media import feed
+
+
+class Command(BaseCommand):
+    help = 'Reload the cached following sets and repair stored follower counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'user_ids',
+            nargs='*',
+            type=int,
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        users = UserModel.objects.order_by('pk')
+        if options['user_ids']:
+            users = users.filter(pk__in=options['user_ids'])
+
+        rebuilt = 0
+        batch = []
+        for user_id in users.values_list('pk', flat=True).iterator():
+            batch.append(user_id)
+            if len(batch) >= options['batch_size']:
+                rebuilt += graph.rebuild(batch)
+                batch = []
+        if batch:
+            rebuilt += graph.rebuild(batch)
+        feed.invalidate_pull_authors()
+        self.stdout.write(
+            self.style.SUCCESS(f'{rebuilt} follow graph entries rebuilt')
+        )
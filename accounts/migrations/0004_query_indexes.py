@@ -0,0 +1,38 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:39
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_relations(apps, schema_editor):
+    Relation = apps.get_model('accounts', 'Relation')
+    duplicates = Relation.objects.order_by().values(
+        'from_user',
+        'to_user',
+    ).annotate(
+        keep=Min('pk'),
+        total=Count('pk'),
+    ).filter(total__gt=1)
+    for duplicate in duplicates:
+        Relation.objects.filter(
+            from_user=duplicate['from_user'],
+            to_user=duplicate['to_user'],
+        ).exclude(pk=duplicate['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_profile_address'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_relations,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='relation',
+            constraint=models.UniqueConstraint(fields=('from_user', 'to_user'), name='accounts_relation_from_to_uniq'),
+        ),
+    ]
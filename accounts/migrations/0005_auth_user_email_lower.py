@@ -0,0 +1,22 @@
+# Generated by Django 4.1.1 on 2026-10-18 19:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('accounts', '0004_query_indexes'),
+    ]
+
+    operations = [
+        # auth_user belongs to django.contrib.auth, so the expression index
+        # on LOWER(email) used by accounts.authentications.users_by_email is
+        # created here instead of through Meta.indexes.
+        migrations.RunSQL(
+            'CREATE INDEX accounts_auth_user_email_lower '
+            'ON auth_user (LOWER(email));',
+            'DROP INDEX accounts_auth_user_email_lower;',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.1.1 on 2026-10-18 21:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_followers(apps, schema_editor):
+    Profile = apps.get_model('accounts', 'Profile')
+    Relation = apps.get_model('accounts', 'Relation')
+    followers = Relation.objects.filter(
+        to_user=OuterRef('user'),
+    ).order_by().values('to_user').annotate(
+        total=Count('pk'),
+    ).values('total')
+    Profile.objects.update(
+        followers_count=Coalesce(Subquery(followers), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_auth_user_email_lower'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(
+            count_followers,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -17,6 +17,14 @@ class Relation(models.Model):
         auto_now_add=True,
     )
 
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('from_user', 'to_user'),
+                name='accounts_relation_from_to_uniq',
+            ),
+        )
+
     def __str__(self):
         return f'{self.from_user} following {self.to_user}'
 
@@ -38,6 +46,13 @@ class Profile(models.Model):
         null=True,
         blank=True,
     )
+    # Kept in step by accounts.graph on follow and unfollow, so reads never
+    # count the relation table.
+    followers_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+    )
 
     def __str__(self):
         return f'{self.user}'
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import graph
+from .models import Relation as RelationModel
+from media import feed
+from utils.queries import insert_or_ignore
+
+
+def followed_user_ids(user, user_ids):
+    if not user.is_authenticated or not user_ids:
+        return set()
+    return graph.followed_among(user.pk, user_ids)
+
+
+def attach_is_following(user, users):
+    followed = followed_user_ids(user, [target.pk for target in users])
+    for target in users:
+        target.is_following = target.pk in followed
+    return users
+
+
+def follow_user(user, target):
+    with transaction.atomic():
+        created = insert_or_ignore(
+            RelationModel,
+            from_user=user.pk,
+            to_user=target.pk,
+            created_at=timezone.now(),
+        )
+        if created:
+            followers = graph.add_edge(user.pk, target.pk)
+            feed.follower_count_changed(target.pk, followers)
+            feed.follow_backfill(user, target)
+    return bool(created)
+
+
+def unfollow_user(user, target):
+    with transaction.atomic():
+        deleted, _ = RelationModel.objects.filter(
+            from_user=user,
+            to_user=target,
+        ).delete()
+        if deleted:
+            followers = graph.remove_edge(user.pk, target.pk)
+            feed.follower_count_changed(target.pk, followers)
+            feed.unfollow_purge(user, target)
+    return bool(deleted)
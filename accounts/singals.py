@@ -3,6 +3,7 @@ from django.dispatch import receiver
 from django.contrib.auth.models import User as UserModel
 
 from .models import Profile as ProfileModel
+from .authentications import invalidate_cached_user
 
 
 @receiver(signals.post_save, sender=UserModel)
@@ -14,3 +15,15 @@ def create_profile(sender, **kwargs):
         ProfileModel.objects.create(
             user=user,
         )
+
+
+@receiver(signals.post_save, sender=UserModel)
+@receiver(signals.post_delete, sender=UserModel)
+def invalidate_user(sender, **kwargs):
+    invalidate_cached_user(kwargs['instance'].pk)
+
+
+@receiver(signals.post_save, sender=ProfileModel)
+@receiver(signals.post_delete, sender=ProfileModel)
+def invalidate_profile_user(sender, **kwargs):
+    invalidate_cached_user(kwargs['instance'].user_id)
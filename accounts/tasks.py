@@ -0,0 +1,38 @@
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.models import User as UserModel
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from tasks.queue import task
+
+
+@task
+def send_password_reset(
+    user_id,
+    subject_template_name,
+    email_template_name,
+    from_email,
+    html_email_template_name,
+    context,
+):
+    # The token is made here, so it never sits in the task table. A user who
+    # was deactivated or removed while the task waited gets nothing.
+    user = UserModel.objects.filter(pk=user_id, is_active=True).first()
+    if user is None or not user.has_usable_password():
+        return
+    email = getattr(user, UserModel.get_email_field_name())
+    PasswordResetForm().send_mail(
+        subject_template_name,
+        email_template_name,
+        {
+            **context,
+            'email': email,
+            'user': user,
+            'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+            'token': default_token_generator.make_token(user),
+        },
+        from_email,
+        email,
+        html_email_template_name,
+    )
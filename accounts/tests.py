@@ -1,3 +1,96 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User as UserModel
 from django.test import TestCase
 
-# Create your tests here.
+from . import graph, services
+from .authentications import users_by_email
+from .forms import UserRegistrationForm
+from .models import (
+    Relation as RelationModel,
+    Profile as ProfileModel,
+)
+
+
+class EmailLookupTests(TestCase):
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            'reader',
+            'Reader@Example.com',
+            'password',
+        )
+        self.accented = UserModel.objects.create_user(
+            'accented',
+            'ÄBC@example.com',
+            'password',
+        )
+
+    def test_lookup_ignores_ascii_case(self):
+        self.assertEqual(list(users_by_email('reader@example.com')), [self.user])
+        self.assertEqual(list(users_by_email('READER@EXAMPLE.COM')), [self.user])
+
+    def test_lookup_non_ascii_address(self):
+        self.assertEqual(list(users_by_email('ÄBC@example.com')), [self.accented])
+        self.assertEqual(list(users_by_email('ÄBC@EXAMPLE.COM')), [self.accented])
+
+    def test_login_with_non_ascii_address(self):
+        self.assertEqual(
+            authenticate(username='ÄBC@example.com', password='password'),
+            self.accented,
+        )
+        self.assertIsNone(
+            authenticate(username='ÄBC@example.com', password='wrong'),
+        )
+
+    def test_registration_rejects_taken_address(self):
+        for email in ('READER@example.com', 'ÄBC@example.com'):
+            form = UserRegistrationForm({
+                'username': 'newcomer',
+                'email': email,
+                'password': 'a long password',
+                'confirm_password': 'a long password',
+            })
+            self.assertFalse(form.is_valid())
+            self.assertIn('email', form.errors)
+
+
+class FollowToggleTests(TestCase):
+    def setUp(self):
+        self.reader = UserModel.objects.create_user('reader', password='password')
+        self.author = UserModel.objects.create_user('author', password='password')
+
+    def assertFollowers(self, count):
+        self.assertEqual(
+            ProfileModel.objects.get(user=self.author).followers_count,
+            count,
+        )
+        self.assertEqual(
+            RelationModel.objects.filter(to_user=self.author).count(),
+            count,
+        )
+
+    def test_follow_is_idempotent(self):
+        self.assertTrue(services.follow_user(self.reader, self.author))
+        self.assertFalse(services.follow_user(self.reader, self.author))
+        self.assertFollowers(1)
+
+    def test_unfollow_is_idempotent(self):
+        services.follow_user(self.reader, self.author)
+        self.assertTrue(services.unfollow_user(self.reader, self.author))
+        self.assertFalse(services.unfollow_user(self.reader, self.author))
+        self.assertFollowers(0)
+
+    def test_unfollow_without_follow_leaves_counter(self):
+        self.assertFalse(services.unfollow_user(self.reader, self.author))
+        self.assertFollowers(0)
+
+    def test_follow_state_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            services.follow_user(self.reader, self.author)
+        self.assertTrue(graph.is_following(self.reader.pk, self.author.pk))
+        self.assertEqual(
+            services.followed_user_ids(self.reader, [self.author.pk]),
+            {self.author.pk},
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            services.unfollow_user(self.reader, self.author)
+        self.assertFalse(graph.is_following(self.reader.pk, self.author.pk))
@@ -24,6 +24,11 @@ urlpatterns = [
         views.UserProfileView.as_view(),
         name='user_profile',
     ),
+    path(
+        'async/profile/<int:user_id>/',
+        views.AsyncUserProfileView.as_view(),
+        name='user_profile_async',
+    ),
     path(
         'profile/edit/<int:user_id>/',
         views.UserProfileEdit.as_view(),
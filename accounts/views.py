@@ -1,3 +1,7 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views import View
 from django.contrib.auth.models import User as UserModel
@@ -5,12 +9,16 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, views as auth_views
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
+from django.conf import settings
 
-from . import forms
+from . import forms, graph, services
 from .models import(
-    Relation as RelationModel,
     Profile as ProfileModel,
 )
+from post import fragments, services as post_services
+from post.models import Post as PostModel
+from utils.async_views import AsyncLoginRequiredMixin
+from utils.pagination import KeysetPaginator
 from utils.base_alerts import BaseAlert
 
 
@@ -127,34 +135,75 @@ class UserProfileView(LoginRequiredMixin, View):
     profile_template = 'accounts/user_profile.html'
 
     def get(self, request, user_id):
-        is_following = False
         user = get_object_or_404(
             UserModel,
             pk=user_id
         )
-        posts = user.posts.all()
-        relation = RelationModel.objects.filter(
-            from_user=request.user,
-            to_user=user_id,
+        page = KeysetPaginator(settings.POSTS_PER_PAGE).page(
+            user.posts.all(),
+            request.GET,
         )
-        if relation.exists():
-            is_following = True
+        fragments.attach_post_versions(page.object_list)
+        post_services.attach_is_liked(request.user, page.object_list)
+        services.attach_is_following(request.user, [user])
 
         return render(
             request,
             self.profile_template,
             {
                 'user': user,
-                'posts': posts,
-                'is_following': is_following,
+                'posts': page,
+                'page': page,
+                'is_following': user.is_following,
+                'followers_count': graph.follower_count(user.pk),
+                'following_count': graph.following_count(user.pk),
+            },
+        )
+
+
+class AsyncUserProfileView(AsyncLoginRequiredMixin, View):
+    profile_template = 'accounts/user_profile.html'
+
+    async def get(self, request, user_id):
+        user, page = await asyncio.gather(
+            UserModel.objects.filter(pk=user_id).afirst(),
+            KeysetPaginator(settings.POSTS_PER_PAGE).apage(
+                PostModel.objects.filter(user=user_id),
+                request.GET,
+            ),
+        )
+        if user is None:
+            raise Http404
+
+        return await sync_to_async(self.render_page)(
+            request,
+            {
+                'user': user,
+                'posts': page,
+                'page': page,
             },
         )
 
+    def render_page(self, request, context):
+        # Follow state comes from the graph cache and the follower count from
+        # the profile, not from Relation.
+        user = context['user']
+        fragments.attach_post_versions(context['page'].object_list)
+        post_services.attach_is_liked(request.user, context['page'].object_list)
+        services.attach_is_following(request.user, [user])
+        context.update(
+            is_following=user.is_following,
+            followers_count=graph.follower_count(user.pk),
+            following_count=graph.following_count(user.pk),
+        )
+        return render(request, self.profile_template, context)
+
 
 class UserPasswordResetView(auth_views.PasswordResetView):
     template_name = 'accounts/password_reset_form.html'
     success_url = reverse_lazy('accounts:password_reset_done')
     email_template_name = 'accounts/password_reset_email.html'
+    form_class = forms.UserPasswordResetForm
 
 
 class UserPasswordResetDoneView(auth_views.PasswordResetDoneView):
@@ -171,31 +220,23 @@ class UserPasswordResetCompleteView(auth_views.PasswordResetCompleteView):
 
 
 class UserFollowView(LoginRequiredMixin, View):
-    def get(self, request, user_id):
+    def post(self, request, user_id):
         user = get_object_or_404(
             UserModel,
             pk=user_id
         )
-        is_relation = RelationModel.objects.filter(
-            from_user=request.user,
-            to_user=user,
-        )
-        if is_relation.exists():
-            messages.error(
-                request,
-                BaseAlert.already_follow,
-                'danger',
-            )
-        else:
-            RelationModel.objects.create(
-                from_user=request.user,
-                to_user=user,
-            )
+        if services.follow_user(request.user, user):
             messages.success(
                 request,
                 BaseAlert.success_follow,
                 'success',
             )
+        else:
+            messages.error(
+                request,
+                BaseAlert.already_follow,
+                'danger',
+            )
         return redirect(
             'accounts:user_profile',
             user.id
@@ -203,17 +244,12 @@ class UserFollowView(LoginRequiredMixin, View):
 
 
 class UserUnFollowView(LoginRequiredMixin, View):
-    def get(self, request, user_id):
+    def post(self, request, user_id):
         user = get_object_or_404(
             UserModel,
             pk=user_id,
         )
-        is_relation = RelationModel.objects.filter(
-            from_user=request.user,
-            to_user=user,
-        )
-        if is_relation.exists():
-            is_relation.delete()
+        if services.unfollow_user(request.user, user):
             messages.success(
                 request,
                 BaseAlert.success_delete_relation,
@@ -0,0 +1,295 @@
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User as UserModel
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from post.models import Post as PostModel
+from social_media.metrics import (
+    PERCENTILES,
+    RequestSample,
+    percentile,
+    wrap_connections,
+)
+
+
+WORDS = (
+    'django', 'python', 'coffee', 'travel', 'music', 'sunset', 'weekend',
+    'coding', 'garden', 'football', 'recipe', 'mountain', 'startup',
+    'concert', 'library', 'holiday', 'camera', 'running', 'morning',
+    'database', 'friends', 'kitten', 'ocean', 'winter', 'summer',
+)
+
+
+class Scenario:
+    # Scenarios that write rows are only run when the caller allows it.
+    def __init__(self, name, run, async_run=None, writes=False):
+        self.name = name
+        self.run = run
+        self.async_run = async_run
+        self.writes = writes
+
+
+def home(client, data, rng):
+    return client.get('/')
+
+
+def async_home(client, data, rng):
+    return client.get('/async/')
+
+
+def post_detail(client, data, rng):
+    post_id, slug = rng.choice(data['posts'])
+    return client.get(f'/posts/{post_id}/{slug}/')
+
+
+def async_post_detail(client, data, rng):
+    post_id, slug = rng.choice(data['posts'])
+    return client.get(f'/posts/async/{post_id}/{slug}/')
+
+
+def user_profile(client, data, rng):
+    return client.get(f'/accounts/profile/{rng.choice(data["users"])}/')
+
+
+def async_user_profile(client, data, rng):
+    return client.get(f'/accounts/async/profile/{rng.choice(data["users"])}/')
+
+
+def post_like(client, data, rng):
+    post_id, _ = rng.choice(data['posts'])
+    return client.post(f'/posts/like/{post_id}/')
+
+
+def post_comment(client, data, rng):
+    post_id, slug = rng.choice(data['posts'])
+    return client.post(
+        f'/posts/{post_id}/{slug}/',
+        {'body': ' '.join(rng.choices(WORDS, k=8))},
+    )
+
+
+def search(client, data, rng):
+    return client.get('/', {'search': rng.choice(WORDS)})
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario('home', home, async_home),
+        Scenario('post_detail', post_detail, async_post_detail),
+        Scenario('user_profile', user_profile, async_user_profile),
+        Scenario('post_like', post_like, writes=True),
+        Scenario('post_comment', post_comment, writes=True),
+        Scenario('search', search),
+    )
+}
+
+
+def load_data(sample_size, rng):
+    post_ids = list(PostModel.objects.values_list('pk', flat=True)[:sample_size * 10])
+    posts = list(
+        PostModel.objects.filter(
+            pk__in=rng.sample(post_ids, min(sample_size, len(post_ids))),
+        ).values_list('pk', 'slug')
+    )
+    user_ids = list(UserModel.objects.values_list('pk', flat=True)[:sample_size * 10])
+    return {
+        'posts': posts,
+        'users': rng.sample(user_ids, min(sample_size, len(user_ids))),
+    }
+
+
+def _worker(scenario, data, viewer_ids, requests, seed):
+    rng = random.Random(seed)
+    client = Client()
+    client.force_login(UserModel.objects.get(pk=rng.choice(viewer_ids)))
+    rows = []
+    try:
+        for _ in range(requests):
+            sample = RequestSample('BENCH')
+            start = perf_counter()
+            with connection.execute_wrapper(sample):
+                response = scenario.run(client, data, rng)
+            elapsed = (perf_counter() - start) * 1000
+            _check(scenario, response)
+            rows.append((elapsed, sample.queries))
+    finally:
+        connections.close_all()
+    return rows
+
+
+def _check(scenario, response):
+    if response.status_code >= 400:
+        raise RuntimeError(f'{scenario.name} returned {response.status_code}')
+
+
+async def _async_request(scenario, client, data, rng):
+    # ASGIHandler gives every request its own ThreadSensitiveContext, and
+    # with it its own executor thread and connection; AsyncClient does not.
+    async with ThreadSensitiveContext():
+        sample = RequestSample('BENCH')
+        stack = ExitStack()
+        await sync_to_async(wrap_connections)(stack, sample)
+        start = perf_counter()
+        try:
+            response = await scenario.async_run(client, data, rng)
+        finally:
+            elapsed = (perf_counter() - start) * 1000
+            await sync_to_async(stack.close)()
+            await sync_to_async(connections.close_all)()
+    _check(scenario, response)
+    return elapsed, sample.queries
+
+
+async def _async_worker(scenario, client, data, requests, seed):
+    rng = random.Random(seed)
+    return [
+        await _async_request(scenario, client, data, rng)
+        for _ in range(requests)
+    ]
+
+
+async def _async_workers(scenario, clients, data, requests, seed):
+    results = await asyncio.gather(*(
+        _async_worker(scenario, client, data, requests, seed + index)
+        for index, client in enumerate(clients)
+    ))
+    return [row for rows in results for row in rows]
+
+
+def run_async_scenario(scenario, data, viewer_ids, requests, concurrency, seed):
+    # Concurrency here is the number of requests in flight on one event
+    # loop, which is how a single ASGI worker serves them.
+    per_worker = max(requests // concurrency, 1)
+    clients = []
+    for index in range(concurrency):
+        rng = random.Random(seed + index)
+        client = AsyncClient()
+        client.force_login(UserModel.objects.get(pk=rng.choice(viewer_ids)))
+        clients.append(client)
+
+    start = perf_counter()
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        rows = asyncio.run(
+            _async_workers(scenario, clients, data, per_worker, seed),
+        )
+    return summarize(
+        f'{scenario.name}:async',
+        rows,
+        perf_counter() - start,
+    )
+
+
+def summarize(name, rows, elapsed):
+    latencies = [row[0] for row in rows]
+    queries = [row[1] for row in rows]
+    return {
+        'scenario': name,
+        'requests': len(rows),
+        'throughput': round(len(rows) / elapsed, 1) if elapsed else 0,
+        **{
+            f'p{rank}_ms': round(percentile(latencies, rank), 3)
+            for rank in PERCENTILES
+        },
+        'queries_mean': round(sum(queries) / len(queries), 2) if queries else 0,
+        'queries_max': max(queries, default=0),
+    }
+
+
+def run_scenario(scenario, data, viewer_ids, requests, concurrency, seed):
+    per_worker = max(requests // concurrency, 1)
+    start = perf_counter()
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        if concurrency == 1:
+            rows = _worker(scenario, data, viewer_ids, per_worker, seed)
+        else:
+            with ThreadPoolExecutor(concurrency) as executor:
+                rows = []
+                for result in executor.map(
+                    lambda index: _worker(
+                        scenario,
+                        data,
+                        viewer_ids,
+                        per_worker,
+                        seed + index,
+                    ),
+                    range(concurrency),
+                ):
+                    rows.extend(result)
+    return summarize(scenario.name, rows, perf_counter() - start)
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    baseline = {row['scenario']: row for row in baseline}
+    for row in results:
+        previous = baseline.get(row['scenario'])
+        if previous is None:
+            continue
+        if row['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f'{row["scenario"]}: p95 {row["p95_ms"]}ms '
+                f'> baseline {previous["p95_ms"]}ms'
+            )
+        if row['queries_max'] > previous['queries_max']:
+            regressions.append(
+                f'{row["scenario"]}: {row["queries_max"]} queries '
+                f'> baseline {previous["queries_max"]}'
+            )
+    return regressions
+
+
+def probe_startup(path):
+    # Each run is a fresh interpreter that imports the WSGI application, as
+    # a new worker does, then serves one request.
+    module = settings.WSGI_APPLICATION.rpartition('.')[0]
+    start = perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-m', 'social_media.probe', module, path],
+        capture_output=True,
+        check=True,
+        cwd=settings.BASE_DIR,
+        env=os.environ,
+        text=True,
+    )
+    row = json.loads(result.stdout.splitlines()[-1])
+    row['process_ms'] = round((perf_counter() - start) * 1000, 3)
+    return row
+
+
+def measure_startup(runs, path):
+    rows = [probe_startup(path) for _ in range(runs)]
+    median = {
+        key: round(percentile([row[key] for row in rows], 50), 3)
+        for key in ('boot_ms', 'first_request_ms', 'process_ms')
+    }
+    return {
+        'scenario': 'startup',
+        'runs': len(rows),
+        'status': rows[-1]['status'],
+        **median,
+        'boot_max_ms': max(row['boot_ms'] for row in rows),
+        'boot_rss_mb': max(row['boot_rss_mb'] for row in rows),
+        'rss_mb': max(row['rss_mb'] for row in rows),
+    }
+
+
+def compare_startup(result, baseline, tolerance):
+    regressions = []
+    for key in ('boot_ms', 'first_request_ms', 'rss_mb'):
+        if result[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f'{key} {result[key]} > baseline {baseline[key]}')
+    return regressions
+
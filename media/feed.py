@@ -0,0 +1,216 @@
+import asyncio
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+
+from accounts import graph
+from accounts.models import (
+    Relation as RelationModel,
+    Profile as ProfileModel,
+)
+from post.models import Post as PostModel
+from utils.pagination import KeysetPaginator
+from .models import FeedItem as FeedItemModel
+
+PULL_AUTHORS_KEY = 'feed:pull_authors'
+
+
+def _follower_ids(author_id, limit):
+    return list(
+        RelationModel.objects.filter(
+            to_user=author_id,
+        ).values_list('from_user', flat=True)[:limit]
+    )
+
+
+def pull_authors():
+    # Authors over the fan-out limit never push into feeds, so their posts
+    # are merged in on read. They are few, so the whole set is cached and
+    # read from the stored follower counts when it is missing.
+    authors = cache.get(PULL_AUTHORS_KEY)
+    if authors is None:
+        authors = frozenset(
+            ProfileModel.objects.filter(
+                followers_count__gt=settings.FEED_FANOUT_FOLLOWER_LIMIT,
+            ).values_list('user', flat=True)
+        )
+        cache.set(PULL_AUTHORS_KEY, authors, settings.FEED_PULL_AUTHORS_TIMEOUT)
+    return authors
+
+
+def invalidate_pull_authors():
+    transaction.on_commit(partial(cache.delete, PULL_AUTHORS_KEY))
+
+
+def follower_count_changed(author_id, count):
+    # The set only changes when a follow or unfollow moves an author across
+    # the limit, which the transaction making the move sees as its count.
+    limit = settings.FEED_FANOUT_FOLLOWER_LIMIT
+    if count in (limit, limit + 1):
+        invalidate_pull_authors()
+
+
+def is_pull_author(author_id):
+    return author_id in pull_authors()
+
+
+def pull_author_ids(user):
+    return sorted(graph.followed_among(user.pk, pull_authors()))
+
+
+def fan_out_post(post, followers=True):
+    limit = settings.FEED_FANOUT_FOLLOWER_LIMIT
+    owner_ids = [post.user_id]
+    if followers:
+        follower_ids = _follower_ids(post.user_id, limit + 1)
+        if len(follower_ids) <= limit:
+            owner_ids.extend(follower_ids)
+
+    FeedItemModel.objects.bulk_create(
+        [
+            FeedItemModel(
+                owner_id=owner_id,
+                post_id=post.pk,
+                created_at=post.created_at,
+            )
+            for owner_id in owner_ids
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    trim_feeds(owner_ids)
+
+
+def trim_feeds(owner_ids):
+    if not owner_ids:
+        return
+    connection = connections[router.db_for_write(FeedItemModel)]
+    quote = connection.ops.quote_name
+    table = quote(FeedItemModel._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(owner_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE {quote("id")} IN ('
+            f'SELECT {quote("id")} FROM ('
+            f'SELECT {quote("id")}, ROW_NUMBER() OVER ('
+            f'PARTITION BY {quote("owner_id")} '
+            f'ORDER BY {quote("created_at")} DESC, {quote("post_id")} DESC'
+            f') AS row_number FROM {table} '
+            f'WHERE {quote("owner_id")} IN ({placeholders})'
+            f') AS ranked WHERE row_number > %s)',
+            [*owner_ids, settings.FEED_MAX_LENGTH],
+        )
+
+
+def rebuild_feed(user):
+    pull_ids = pull_author_ids(user)
+    followed = RelationModel.objects.filter(
+        from_user=user,
+    ).exclude(
+        to_user__in=pull_ids,
+    ).values('to_user')
+    posts = PostModel.objects.filter(
+        user__in=followed,
+    ) | PostModel.objects.filter(
+        user=user,
+    )
+    FeedItemModel.objects.filter(owner=user).delete()
+    FeedItemModel.objects.bulk_create(
+        [
+            FeedItemModel(
+                owner=user,
+                post_id=post_id,
+                created_at=created_at,
+            )
+            for post_id, created_at in posts.order_by(
+                '-created_at',
+                '-id',
+            ).values_list('id', 'created_at')[:settings.FEED_MAX_LENGTH]
+        ],
+        batch_size=500,
+    )
+
+
+def follow_backfill(user, author):
+    if is_pull_author(author.pk):
+        return
+    posts = PostModel.objects.filter(
+        user=author,
+    ).order_by(
+        '-created_at',
+        '-id',
+    ).values_list('id', 'created_at')[:settings.FEED_PAGE_SIZE]
+    FeedItemModel.objects.bulk_create(
+        [
+            FeedItemModel(
+                owner=user,
+                post_id=post_id,
+                created_at=created_at,
+            )
+            for post_id, created_at in posts
+        ],
+        ignore_conflicts=True,
+    )
+    trim_feeds([user.pk])
+
+
+def unfollow_purge(user, author):
+    FeedItemModel.objects.filter(
+        owner=user,
+        post__user=author,
+    ).delete()
+
+
+def _pushed_window():
+    return KeysetPaginator(settings.FEED_PAGE_SIZE, id_field='post_id')
+
+
+def _pushed_items(user):
+    return FeedItemModel.objects.filter(
+        owner=user,
+    ).select_related('post__user')
+
+
+def _pulled_posts(authors):
+    return PostModel.objects.filter(
+        user__in=authors,
+    ).select_related('user')
+
+
+def home_feed(user, params):
+    paginator = KeysetPaginator(settings.FEED_PAGE_SIZE)
+    pushed = [
+        item.post
+        for item in _pushed_window().window(_pushed_items(user), params)
+    ]
+    pull_ids = pull_author_ids(user)
+    if not pull_ids:
+        return paginator.build_page(pushed, params)
+
+    pulled = paginator.window(_pulled_posts(pull_ids), params)
+    return paginator.build_page(
+        paginator.merge((pushed, pulled), params),
+        params,
+    )
+
+
+async def ahome_feed(user, params):
+    # The pull authors come from the cache; both windows are then read at
+    # once.
+    paginator = KeysetPaginator(settings.FEED_PAGE_SIZE)
+    pull_ids = await sync_to_async(pull_author_ids)(user)
+    if not pull_ids:
+        items = await _pushed_window().awindow(_pushed_items(user), params)
+        return paginator.build_page([item.post for item in items], params)
+
+    items, pulled = await asyncio.gather(
+        _pushed_window().awindow(_pushed_items(user), params),
+        paginator.awindow(_pulled_posts(pull_ids), params),
+    )
+    return paginator.build_page(
+        paginator.merge(([item.post for item in items], pulled), params),
+        params,
+    )
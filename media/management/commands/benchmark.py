@@ -0,0 +1,132 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from media import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the main views through the test client against the current '
+        'database and report latency percentiles and query counts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios',
+            nargs='*',
+            choices=[[], *benchmarks.SCENARIOS],
+            metavar='scenario',
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=1)
+        parser.add_argument('--sample-size', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--mode',
+            choices=('sync', 'async', 'both'),
+            default='sync',
+            help='Run the sync views, their async variants, or both.',
+        )
+        parser.add_argument(
+            '--allow-writes',
+            action='store_true',
+            help=(
+                'Run the scenarios that create likes and comments in the '
+                'configured database. They are skipped without this flag.'
+            ),
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON results of an earlier run to compare against.',
+        )
+        parser.add_argument(
+            '--save',
+            help='Write the results as JSON to this file.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative p95 slowdown before failing.',
+        )
+
+    def write_row(self, row):
+        self.stdout.write(
+            f'{row["scenario"]:<20}{row["requests"]:>6} req '
+            f'{row["throughput"]:>8} req/s  '
+            f'p50 {row["p50_ms"]:>8}ms  p95 {row["p95_ms"]:>8}ms  '
+            f'p99 {row["p99_ms"]:>8}ms  '
+            f'queries {row["queries_mean"]} (max {row["queries_max"]})'
+        )
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(benchmarks.SCENARIOS)
+        if not options['allow_writes']:
+            writing = [
+                name
+                for name in names
+                if benchmarks.SCENARIOS[name].writes
+            ]
+            if options['scenarios'] and writing:
+                raise CommandError(
+                    f'{", ".join(writing)} write to the configured database; '
+                    f'pass --allow-writes to run them.'
+                )
+            if writing:
+                self.stdout.write(self.style.WARNING(
+                    f'Skipping {", ".join(writing)}; pass --allow-writes to '
+                    f'run them against the configured database.'
+                ))
+            names = [name for name in names if name not in writing]
+
+        rng = random.Random(options['seed'])
+        data = benchmarks.load_data(options['sample_size'], rng)
+        if not data['posts'] or not data['users']:
+            raise CommandError(
+                'No data to benchmark; run seed_social_graph first.'
+            )
+
+        runners = []
+        if options['mode'] in ('sync', 'both'):
+            runners.append(benchmarks.run_scenario)
+        if options['mode'] in ('async', 'both'):
+            runners.append(benchmarks.run_async_scenario)
+
+        results = []
+        for name in names:
+            scenario = benchmarks.SCENARIOS[name]
+            for runner in runners:
+                if (
+                    runner is benchmarks.run_async_scenario
+                    and scenario.async_run is None
+                ):
+                    continue
+                row = runner(
+                    scenario,
+                    data,
+                    data['users'],
+                    options['requests'],
+                    options['concurrency'],
+                    options['seed'],
+                )
+                results.append(row)
+                self.write_row(row)
+
+        if options['save']:
+            with open(options['save'], 'w') as file:
+                json.dump(results, file, indent=2)
+
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                regressions = benchmarks.compare(
+                    results,
+                    json.load(file),
+                    options['tolerance'],
+                )
+            if regressions:
+                raise CommandError(
+                    'Regressions against baseline:\n' + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from social_media import metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Dump per-view latency and query percentiles from the snapshots '
+        'workers write to HOT_PATH_SNAPSHOT_DIR.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+        )
+
+    def handle(self, *args, **options):
+        summary = metrics.summarize(metrics.load_snapshots())
+        if options['clear']:
+            metrics.clear_snapshots()
+
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+
+        self.stdout.write(f'{summary["requests"]} requests recorded')
+        header = f'{"view":<32}{"count":>7}'
+        for metric in metrics.METRICS:
+            header += f'{metric + " p50/p95/p99":>30}'
+        self.stdout.write(header)
+        for view_name, row in summary['views'].items():
+            line = f'{view_name:<32}{row["count"]:>7}'
+            for metric in metrics.METRICS:
+                values = '/'.join(
+                    f'{row[metric][f"p{rank}"]:g}'
+                    for rank in metrics.PERCENTILES
+                )
+                line += f'{values:>30}'
+            self.stdout.write(line)
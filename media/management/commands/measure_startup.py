@@ -0,0 +1,62 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from media import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Start fresh worker processes with the current settings and report '
+        'boot time, first request latency and resident memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument(
+            '--path',
+            default='/accounts/login/',
+            help='Path of the first request each worker serves.',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='JSON result of an earlier run to compare against.',
+        )
+        parser.add_argument(
+            '--save',
+            help='Write the result as JSON to this file.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative increase before failing.',
+        )
+
+    def handle(self, *args, **options):
+        result = benchmarks.measure_startup(options['runs'], options['path'])
+        self.stdout.write(
+            f'{result["runs"]} workers  '
+            f'boot {result["boot_ms"]}ms (max {result["boot_max_ms"]}ms)  '
+            f'first request {result["first_request_ms"]}ms '
+            f'[{result["status"]}]  '
+            f'process {result["process_ms"]}ms  '
+            f'rss {result["boot_rss_mb"]}MB after boot, {result["rss_mb"]}MB after first request'
+        )
+
+        if options['save']:
+            with open(options['save'], 'w') as file:
+                json.dump(result, file, indent=2)
+
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                regressions = benchmarks.compare_startup(
+                    result,
+                    json.load(file),
+                    options['tolerance'],
+                )
+            if regressions:
+                raise CommandError(
+                    'Regressions against baseline:\n' + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
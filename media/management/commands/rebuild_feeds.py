@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User as UserModel
+
+from media import feed
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stored home timeline of every user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'user_ids',
+            nargs='*',
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        users = UserModel.objects.order_by('pk')
+        if options['user_ids']:
+            users = users.filter(pk__in=options['user_ids'])
+
+        rebuilt = 0
+        for user in users.iterator():
+            feed.rebuild_feed(user)
+            rebuilt += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'{rebuilt} home timelines rebuilt')
+        )
@@ -0,0 +1,195 @@
+import random
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User as UserModel
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.text import slugify
+
+from accounts.models import (
+    Relation as RelationModel,
+    Profile as ProfileModel,
+)
+from post.models import (
+    Post as PostModel,
+    Comment as CommentModel,
+    Like as LikeModel,
+)
+from media.benchmarks import WORDS
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic social graph: users with a power-law follower '
+        'distribution, posts, likes and comment reply trees.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--likes', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--following',
+            type=int,
+            default=50,
+            help='Average number of users each user follows.',
+        )
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            default=1.1,
+            help='Power-law exponent of user popularity.',
+        )
+        parser.add_argument(
+            '--reply-ratio',
+            type=float,
+            default=0.6,
+            help='Share of comments that are replies.',
+        )
+        parser.add_argument('--prefix', default='bench')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        with transaction.atomic():
+            users = self.create_users(options['users'], options['prefix'])
+            # Popularity by rank follows a Zipf curve, so a few users collect
+            # most followers, likes and comments.
+            self.popular = users[:]
+            self.rng.shuffle(self.popular)
+            self.weights = list(accumulate(
+                1 / (rank + 1) ** options['alpha']
+                for rank in range(len(self.popular))
+            ))
+            self.create_relations(users, options['following'])
+            posts = self.create_posts(options['posts'])
+            self.create_likes(users, posts, options['likes'])
+            self.create_comments(
+                users,
+                posts,
+                options['comments'],
+                options['reply_ratio'],
+            )
+
+        for command in (
+            'repair_counters',
+            # Stored follower counts decide who is pulled by rebuild_feeds.
+            'rebuild_graph',
+            'rebuild_feeds',
+            'rebuild_search_index',
+        ):
+            call_command(command, stdout=self.stdout)
+
+    def popular_users(self, count):
+        return self.rng.choices(self.popular, cum_weights=self.weights, k=count)
+
+    def bulk_create(self, model, objs, **kwargs):
+        model.objects.bulk_create(
+            objs,
+            batch_size=self.batch_size,
+            **kwargs,
+        )
+        self.stdout.write(f'{len(objs)} {model._meta.verbose_name_plural} generated')
+
+    def created_ids(self, model, objs):
+        # Backends without bulk RETURNING leave pk unset; this command is the
+        # only writer inside its transaction, so the newest rows are ours.
+        if all(obj.pk for obj in objs):
+            return [obj.pk for obj in objs]
+        return list(reversed(
+            model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objs)]
+        ))
+
+    def create_users(self, count, prefix):
+        password = make_password('password')
+        start = UserModel.objects.filter(username__startswith=prefix).count()
+        objs = [
+            UserModel(
+                username=f'{prefix}{index}',
+                email=f'{prefix}{index}@example.com',
+                password=password,
+            )
+            for index in range(start, start + count)
+        ]
+        self.bulk_create(UserModel, objs)
+        users = self.created_ids(UserModel, objs)
+        self.bulk_create(
+            ProfileModel,
+            [ProfileModel(user_id=user_id) for user_id in users],
+        )
+        return users
+
+    def create_relations(self, users, following):
+        relations = []
+        for user_id in users:
+            count = min(int(self.rng.expovariate(1 / following)) + 1, len(users))
+            for target in set(self.popular_users(count)):
+                if target != user_id:
+                    relations.append(
+                        RelationModel(from_user_id=user_id, to_user_id=target)
+                    )
+        self.bulk_create(RelationModel, relations, ignore_conflicts=True)
+
+    def caption(self):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(3, 12)))
+
+    def create_posts(self, count):
+        posts = []
+        for author in self.popular_users(count):
+            caption = self.caption()
+            posts.append(
+                PostModel(
+                    user_id=author,
+                    caption=caption,
+                    slug=slugify(caption[:30]),
+                )
+            )
+        self.bulk_create(PostModel, posts)
+        return self.created_ids(PostModel, posts)
+
+    def create_likes(self, users, posts, count):
+        self.bulk_create(
+            LikeModel,
+            [
+                LikeModel(user_id=self.rng.choice(users), post_id=post_id)
+                for post_id in self.rng.choices(posts, k=count)
+            ],
+            ignore_conflicts=True,
+        )
+
+    def create_comments(self, users, posts, count, reply_ratio):
+        replies = int(count * reply_ratio)
+        top_level = [
+            CommentModel(
+                user_id=self.rng.choice(users),
+                post_id=post_id,
+                body=self.caption(),
+            )
+            for post_id in self.rng.choices(posts, k=count - replies)
+        ]
+        self.bulk_create(CommentModel, top_level)
+        parents = list(zip(
+            self.created_ids(CommentModel, top_level),
+            (comment.post_id for comment in top_level),
+        ))
+        if not parents:
+            return
+        self.bulk_create(
+            CommentModel,
+            [
+                CommentModel(
+                    user_id=self.rng.choice(users),
+                    post_id=post_id,
+                    reply_id=parent_id,
+                    is_reply=True,
+                    body=self.caption(),
+                )
+                for parent_id, post_id in self.rng.choices(parents, k=replies)
+            ],
+        )
@@ -0,0 +1,32 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.templates import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Parse every project template, reporting compile time and syntax '
+        'errors. Run it in a deploy step to catch broken templates; workers '
+        'warm their own cache at startup when TEMPLATE_WARMUP is on.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include templates shipped with installed packages.',
+        )
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        loaded, errors = warm_templates(options['all'])
+        elapsed = (perf_counter() - start) * 1000
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(loaded)} templates compiled in {elapsed:.1f}ms')
+        )
+        if errors:
+            raise CommandError(f'{len(errors)} templates failed to compile')
@@ -1,3 +1,39 @@
 from django.db import models
+from django.contrib.auth.models import User as UserModel
 
-# Create your models here.
+from post.models import Post as PostModel
+
+
+class FeedItem(models.Model):
+    owner = models.ForeignKey(
+        UserModel,
+        on_delete=models.CASCADE,
+        related_name='feed_items',
+    )
+    post = models.ForeignKey(
+        PostModel,
+        on_delete=models.CASCADE,
+        related_name='feed_items',
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = (
+            '-created_at',
+            '-post',
+        )
+        indexes = (
+            models.Index(
+                fields=('owner', '-created_at', '-post'),
+                name='media_feed_owner_created_idx',
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('owner', 'post'),
+                name='media_feed_owner_post_uniq',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.owner} feed {self.post_id}'
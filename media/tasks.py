@@ -0,0 +1,11 @@
+from post.models import Post as PostModel
+from tasks.queue import task
+from . import feed
+
+
+@task
+def fan_out(post_id):
+    post = PostModel.objects.filter(pk=post_id).first()
+    if post is None:
+        return
+    feed.fan_out_post(post)
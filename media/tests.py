@@ -1,3 +1,43 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User as UserModel
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase
+
+from post.models import (
+    Post as PostModel,
+    Comment as CommentModel,
+    Like as LikeModel,
+)
+
+
+# The benchmark workers close their connections, which a TestCase
+# transaction does not survive.
+class BenchmarkWriteGuardTests(TransactionTestCase):
+    def setUp(self):
+        user = UserModel.objects.create_user('author', password='password')
+        PostModel.objects.create(user=user, caption='first post', slug='first-post')
+
+    def benchmark(self, *args):
+        stdout = StringIO()
+        call_command('benchmark', '--requests', '2', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_write_scenarios_need_flag(self):
+        for name in ('post_like', 'post_comment'):
+            with self.subTest(name=name):
+                with self.assertRaisesMessage(CommandError, '--allow-writes'):
+                    self.benchmark('home', name)
+        self.assertFalse(LikeModel.objects.exists())
+        self.assertFalse(CommentModel.objects.exists())
+
+    def test_default_run_skips_write_scenarios(self):
+        output = self.benchmark()
+        self.assertIn('Skipping post_like, post_comment', output)
+        self.assertIn('home', output)
+        self.assertFalse(LikeModel.objects.exists())
+        self.assertFalse(CommentModel.objects.exists())
+
+    def test_allow_writes(self):
+        self.benchmark('--allow-writes', 'post_like', 'post_comment')
+        self.assertTrue(CommentModel.objects.exists())
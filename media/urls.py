@@ -10,4 +10,9 @@ urlpatterns = [
         views.HomeView.as_view(),
         name='home'
     ),
+    path(
+        'async/',
+        views.AsyncHomeView.as_view(),
+        name='home_async',
+    ),
 ]
@@ -1,26 +1,91 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render
 from django.views import View
 
 from post.models import Post as PostModel
 from post.forms import PostSearchForm
+from post import fragments, services
+from utils.async_views import aget_user
+from utils.pagination import KeysetPaginator
+from . import feed
 
 
 class HomeView(View):
     def get(self, request):
-        posts = PostModel.objects.all()
-        form = PostSearchForm()
+        paginator = KeysetPaginator(settings.POSTS_PER_PAGE)
+        search_page = None
 
-        search = request.GET.get('search')
-        if search:
-            posts = PostModel.objects.filter(
-                slug__contains=search,
+        if 'search' in request.GET:
+            form = PostSearchForm(request.GET)
+        else:
+            form = PostSearchForm()
+
+        if form.is_bound and form.is_valid():
+            search_page = page = form.results(request.GET.get('page'))
+        elif request.user.is_authenticated:
+            page = feed.home_feed(
+                request.user,
+                request.GET,
+            )
+        else:
+            page = paginator.page(
+                PostModel.objects.all(),
+                request.GET,
             )
 
+        fragments.attach_post_versions(page.object_list)
+        services.attach_is_liked(request.user, page.object_list)
         return render(
             request,
             'media/content.html',
             {
-                'posts': posts,
+                'posts': page,
+                'page': page,
+                'search_page': search_page,
                 'form': form,
             }
         )
+
+
+class AsyncHomeView(View):
+    template_name = 'media/content.html'
+
+    async def get(self, request):
+        search_page = None
+
+        if 'search' in request.GET:
+            form = PostSearchForm(request.GET)
+        else:
+            form = PostSearchForm()
+
+        user = await aget_user(request)
+        if form.is_bound and form.is_valid():
+            search_page = page = await sync_to_async(form.results)(
+                request.GET.get('page'),
+            )
+        elif user.is_authenticated:
+            page = await feed.ahome_feed(
+                user,
+                request.GET,
+            )
+        else:
+            page = await KeysetPaginator(settings.POSTS_PER_PAGE).apage(
+                PostModel.objects.all(),
+                request.GET,
+            )
+
+        return await sync_to_async(self.render_page)(
+            request,
+            {
+                'posts': page,
+                'page': page,
+                'search_page': search_page,
+                'form': form,
+            },
+        )
+
+    def render_page(self, request, context):
+        fragments.attach_post_versions(context['page'].object_list)
+        services.attach_is_liked(request.user, context['page'].object_list)
+        return render(request, self.template_name, context)
@@ -11,6 +11,7 @@ class PostAdmin(admin.ModelAdmin):
     list_display = (
         'user',
         'slug',
+        'likes_count',
         'updated_at',
     )
     search_fields = (
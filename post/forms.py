@@ -1,4 +1,8 @@
 from django import forms
+from django.conf import settings
+from django.core.paginator import Paginator
+
+from . import search
 from .models import (
     Post as PostModel,
     Comment as CommentModel,
@@ -82,3 +86,10 @@ class PostSearchForm(forms.Form):
             },
         ),
     )
+
+    def results(self, page_number=None):
+        results = search.search_posts(self.cleaned_data['search'])
+        return Paginator(
+            results,
+            settings.SEARCH_RESULTS_PER_PAGE,
+        ).get_page(page_number)
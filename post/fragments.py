@@ -0,0 +1,91 @@
+import time
+from functools import partial
+
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+
+POST_VERSION_KEY = 'fragment:post:{}:version'
+THREAD_VERSION_KEY = 'fragment:thread:{}:version'
+
+
+def fragment_cache():
+    return caches['template_fragments']
+
+
+def _new_version():
+    # Seeded from the clock so a version key that was evicted never comes
+    # back with a number an old, still cached fragment was stored under.
+    return time.time_ns()
+
+
+def _bump(key):
+    cache = fragment_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def _bump_on_commit(key):
+    # Bumping before commit would let a concurrent reader cache the old rows
+    # under the new version.
+    transaction.on_commit(partial(_bump, key))
+
+
+def bump_post(post_id):
+    _bump_on_commit(POST_VERSION_KEY.format(post_id))
+
+
+def bump_thread(comment_id):
+    _bump_on_commit(THREAD_VERSION_KEY.format(comment_id))
+
+
+def _attach_versions(objs, key_format):
+    cache = fragment_cache()
+    keys = {obj.pk: key_format.format(obj.pk) for obj in objs}
+    versions = cache.get_many(keys.values())
+    for obj in objs:
+        key = keys[obj.pk]
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+        obj.fragment_version = versions[key]
+    return objs
+
+
+def attach_post_versions(posts):
+    return _attach_versions(posts, POST_VERSION_KEY)
+
+
+def attach_thread_versions(comments):
+    return _attach_versions(comments, THREAD_VERSION_KEY)
+
+
+def cached_pks(fragment_name, objs):
+    keys = {
+        make_template_fragment_key(
+            fragment_name,
+            (obj.pk, obj.fragment_version),
+        ): obj.pk
+        for obj in objs
+    }
+    return {keys[key] for key in fragment_cache().get_many(keys)}
+
+
+def attach_replies(comments, load_replies):
+    # Threads already in the cache only get a callable, which the template
+    # calls if the fragment disappears between this check and rendering.
+    attach_thread_versions(comments)
+    cached = cached_pks('comment_thread', comments)
+    load_replies([comment for comment in comments if comment.pk not in cached])
+    for comment in comments:
+        if comment.pk in cached:
+            comment.reply_list = partial(_replies, comment, load_replies)
+    return comments
+
+
+def _replies(comment, load_replies):
+    load_replies([comment])
+    return comment.reply_list
@@ -0,0 +1,146 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import fragments
+from .models import (
+    Post as PostModel,
+    Like as LikeModel,
+)
+from utils.queries import delete_where, insert_or_ignore
+
+
+logger = logging.getLogger('post.like_buffer')
+
+LIKE_STATE_KEY = 'likes:state:{}:{}'
+
+
+def _state_key(user_id, post_id):
+    return LIKE_STATE_KEY.format(user_id, post_id)
+
+
+def apply_likes(batch):
+    # Every buffered (user, post) -> state is written in one transaction.
+    # Row counts keep the counters exact; each post gets a single counter
+    # update and fragment bump however many clicks it collected.
+    now = timezone.now()
+    deltas = Counter()
+    with transaction.atomic():
+        for (user_id, post_id), like in batch.items():
+            if like:
+                deltas[post_id] += insert_or_ignore(
+                    LikeModel,
+                    user=user_id,
+                    post=post_id,
+                    created_at=now,
+                )
+            else:
+                deltas[post_id] -= delete_where(
+                    LikeModel,
+                    user=user_id,
+                    post=post_id,
+                )
+        for post_id, delta in deltas.items():
+            if delta:
+                PostModel.objects.filter(pk=post_id).update(
+                    likes_count=F('likes_count') + delta,
+                )
+                fragments.bump_post(post_id)
+
+
+class LikeBuffer:
+    # Write-behind buffer for like toggles. Each click stores the new state
+    # of its (user, post) pair in the shared default cache for `timeout`
+    # seconds, so reads on every worker see it, and queues the pair in this
+    # process. A daemon thread flushes every `interval` seconds or as soon
+    # as `max_events` pairs are waiting, writing whatever state the cache
+    # holds then: the last click wins even when it reached another worker.
+    def __init__(self, interval, max_events, timeout):
+        self.interval = interval
+        self.max_events = max_events
+        self.timeout = timeout
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run,
+                    name='like-buffer',
+                    daemon=True,
+                )
+                self.thread.start()
+                atexit.register(self.flush)
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Flushing buffered likes failed')
+            finally:
+                close_old_connections()
+
+    def state(self, user_id, post_id):
+        return cache.get(_state_key(user_id, post_id))
+
+    def add(self, user_id, post_id, like):
+        self.start()
+        # The state is shared before the click is queued, so a read on any
+        # worker sees it as soon as this returns.
+        cache.set(_state_key(user_id, post_id), like, self.timeout)
+        with self.lock:
+            self.pending[(user_id, post_id)] = like
+            full = len(self.pending) >= self.max_events
+        if full:
+            self.wake.set()
+
+    def overlay(self, user_id, post_ids, liked):
+        # Read-your-writes: buffered clicks override what the table says.
+        # Entries outlive the flush, after which they agree with the table.
+        keys = {_state_key(user_id, post_id): post_id for post_id in post_ids}
+        liked = set(liked)
+        for key, like in cache.get_many(keys).items():
+            if like:
+                liked.add(keys[key])
+            else:
+                liked.discard(keys[key])
+        return liked
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, {}
+            if not batch:
+                return 0
+            keys = {_state_key(*pair): pair for pair in batch}
+            for key, like in cache.get_many(keys).items():
+                batch[keys[key]] = like
+            try:
+                apply_likes(batch)
+            except Exception:
+                with self.lock:
+                    for pair, like in batch.items():
+                        self.pending.setdefault(pair, like)
+                raise
+            return len(batch)
+
+
+buffer = LikeBuffer(
+    settings.LIKE_FLUSH_INTERVAL_MS / 1000,
+    settings.LIKE_FLUSH_MAX_EVENTS,
+    settings.LIKE_STATE_TIMEOUT,
+)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from post import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the post search index from scratch.'
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        search.rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Search index rebuilt with {type(backend).__name__}'
+            )
+        )
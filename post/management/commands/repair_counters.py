@@ -0,0 +1,92 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from post.models import (
+    Post as PostModel,
+    Comment as CommentModel,
+    Like as LikeModel,
+)
+from post import fragments, tasks
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized counters stored on posts and comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the repair for the task worker instead of running it.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['enqueue']:
+            tasks.repair_counters.delay(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS('Counter repair queued'))
+            return
+        # One GROUP BY per counter, then only rows that drifted are written
+        # and their cached fragments invalidated.
+        counters = (
+            (
+                'post like',
+                PostModel.objects.only('pk', 'likes_count'),
+                'likes_count',
+                LikeModel.objects.values_list('post'),
+                fragments.bump_post,
+            ),
+            (
+                'post comment',
+                PostModel.objects.only('pk', 'comments_count'),
+                'comments_count',
+                CommentModel.objects.values_list('post'),
+                fragments.bump_post,
+            ),
+            (
+                'comment reply',
+                CommentModel.objects.only('pk', 'replies_count'),
+                'replies_count',
+                CommentModel.objects.filter(
+                    reply__isnull=False,
+                ).values_list('reply'),
+                fragments.bump_thread,
+            ),
+        )
+        for label, queryset, field, groups, bump in counters:
+            counts = dict(
+                groups.order_by().annotate(
+                    total=Count('pk'),
+                )
+            )
+            repaired = self.repair(queryset, field, counts, bump, batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f'{repaired} {label} counters repaired')
+            )
+
+    def repair(self, queryset, field, counts, bump, batch_size):
+        changed = []
+        repaired = 0
+        for obj in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            total = counts.get(obj.pk, 0)
+            if getattr(obj, field) != total:
+                setattr(obj, field, total)
+                changed.append(obj)
+            if len(changed) >= batch_size:
+                repaired += self.flush(queryset.model, field, changed, bump)
+                changed = []
+        repaired += self.flush(queryset.model, field, changed, bump)
+        return repaired
+
+    def flush(self, model, field, objs, bump):
+        if objs:
+            with transaction.atomic():
+                model.objects.bulk_update(objs, (field,))
+                for obj in objs:
+                    bump(obj.pk)
+        return len(objs)
@@ -0,0 +1,37 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Like = apps.get_model('post', 'Like')
+    likes = Like.objects.filter(
+        post=OuterRef('pk'),
+    ).order_by().values('post').annotate(
+        total=Count('pk'),
+    ).values('total')
+    Post.objects.update(
+        likes_count=Coalesce(Subquery(likes), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0005_alter_comment_options_alter_comment_created_at_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_likes_count,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:38
+
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import migrations, models, OperationalError
+import django.db.models.deletion
+
+
+FTS_TABLE = 'post_post_fts'
+
+
+def create_search_index(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    SearchTerm = apps.get_model('post', 'SearchTerm')
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} "
+                f"USING fts5(caption, tokenize='unicode61')"
+            )
+        except OperationalError:
+            pass
+        else:
+            schema_editor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, caption) '
+                f'SELECT id, caption FROM {Post._meta.db_table}'
+            )
+            return
+
+    SearchTerm.objects.bulk_create(
+        [
+            SearchTerm(term=term[:64], post_id=post.pk, frequency=frequency)
+            for post in Post.objects.only('pk', 'caption').iterator()
+            for term, frequency in Counter(
+                re.findall(r'[^\W_]+', ''.join(
+                    char
+                    for char in unicodedata.normalize('NFD', post.caption.lower())
+                    if not unicodedata.combining(char)
+                ))
+            ).items()
+        ],
+        batch_size=500,
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0006_post_likes_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField(default=1)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='post.post')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchterm',
+            constraint=models.UniqueConstraint(fields=('term', 'post'), name='post_searchterm_term_post_uniq'),
+        ),
+        migrations.RunPython(
+            create_search_index,
+            drop_search_index,
+        ),
+    ]
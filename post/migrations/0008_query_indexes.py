@@ -0,0 +1,62 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:39
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Like = apps.get_model('post', 'Like')
+    duplicates = Like.objects.order_by().values('user', 'post').annotate(
+        keep=Min('pk'),
+        total=Count('pk'),
+    ).filter(total__gt=1)
+    for duplicate in duplicates:
+        Like.objects.filter(
+            user=duplicate['user'],
+            post=duplicate['post'],
+        ).exclude(pk=duplicate['keep']).delete()
+
+    likes = Like.objects.filter(
+        post=OuterRef('pk'),
+    ).order_by().values('post').annotate(
+        total=Count('pk'),
+    ).values('total')
+    Post.objects.update(
+        likes_count=Coalesce(Subquery(likes), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0007_searchterm'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_likes,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'reply', '-created_at', '-id'], name='post_comment_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['reply', '-created_at', '-id'], name='post_comment_reply_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created_at', '-id'], name='post_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='post_post_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='post_like_user_post_uniq'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(
+                **{field: OuterRef('pk')},
+            ).order_by().values(field).annotate(
+                total=Count('pk'),
+            ).values('total')
+        ),
+        0,
+    )
+
+
+def backfill_comment_counters(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Comment = apps.get_model('post', 'Comment')
+    Post.objects.update(comments_count=_count(Comment, 'post'))
+    Comment.objects.update(replies_count=_count(Comment, 'reply'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_comment_counters,
+            migrations.RunPython.noop,
+        ),
+    ]
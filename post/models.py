@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import User as UserModel
-from django.urls import reverse
+
+from utils.urls import url_builder
+
+
+post_urls = url_builder('posts')
 
 
 class Post(models.Model):
@@ -17,58 +21,57 @@ class Post(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True,
     )
+    likes_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('-created_at', '-id'),
+                name='post_post_created_idx',
+            ),
+            models.Index(
+                fields=('user', '-created_at', '-id'),
+                name='post_post_user_created_idx',
+            ),
+        )
 
     def get_absolute_url(self):
-        return reverse(
-            'posts:post_create',
+        return post_urls.build(
+            'post_create',
         )
 
     def detail_absolute_url(self):
-        return reverse(
-            'posts:post_detail',
-            args=(
-                self.pk,
-                self.slug,
-            ),
+        return post_urls.build(
+            'post_detail',
+            self.pk,
+            self.slug,
         )
 
     def delete_absolute_url(self):
-        return reverse(
-            'posts:post_delete',
-            args=(
-                self.pk,
-            ),
+        return post_urls.build(
+            'post_delete',
+            self.pk,
         )
 
     def update_absolute_url(self):
-        return reverse(
-            'posts:post_update',
-            args=(
-                self.pk,
-            ),
+        return post_urls.build(
+            'post_update',
+            self.pk,
         )
 
     def like_absolute_url(self):
-        return reverse(
-            'posts:post_like',
-            args=(
-                self.pk,
-            ),
-        )
-
-    def likes_count(self):
-        return self.likes.count()
-
-    def is_like(self, user):
-        is_like = user.likes.filter(
-            post=self,
+        return post_urls.build(
+            'post_like',
+            self.pk,
         )
-        if is_like.exists():
-            return True
-        return False
 
     def __str__(self):
         return f'{self.slug} - {self.created_at}'
@@ -101,11 +104,25 @@ class Comment(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True
     )
+    replies_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = (
             '-created_at',
         )
+        indexes = (
+            models.Index(
+                fields=('post', 'reply', '-created_at', '-id'),
+                name='post_comment_thread_idx',
+            ),
+            models.Index(
+                fields=('reply', '-created_at', '-id'),
+                name='post_comment_reply_idx',
+            ),
+        )
 
     def __str__(self):
         return f'{self.user} - {self.body[:30]}'
@@ -126,5 +143,38 @@ class Like(models.Model):
         auto_now_add=True,
     )
 
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='post_like_user_post_uniq',
+            ),
+        )
+
     def __str__(self):
         return f'{self.user} Like {self.post.slug}'
+
+
+class SearchTerm(models.Model):
+    term = models.CharField(
+        max_length=64,
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+    )
+    frequency = models.PositiveIntegerField(
+        default=1,
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'),
+                name='post_searchterm_term_post_uniq',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.term} in {self.post_id}'
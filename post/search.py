@@ -0,0 +1,227 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connection,
+    connections,
+    router,
+    transaction,
+)
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import (
+    Post as PostModel,
+    SearchTerm as SearchTermModel,
+)
+
+
+FTS_TABLE = 'post_post_fts'
+TERM_MAX_LENGTH = 64
+# Splits and folds like FTS5's unicode61 tokenizer, so both backends match
+# the same posts: underscores separate tokens and diacritics are dropped.
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def _fold(text):
+    return ''.join(
+        char
+        for char in unicodedata.normalize('NFD', text.lower())
+        if not unicodedata.combining(char)
+    )
+
+
+def tokenize(text):
+    return [
+        token[:TERM_MAX_LENGTH]
+        for token in TOKEN_PATTERN.findall(_fold(text))
+    ]
+
+
+class FTS5Backend:
+    def _execute(self, sql, params=(), using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _match(self, terms):
+        return ' '.join(f'"{term}"' for term in terms)
+
+    def index(self, post):
+        self.remove(post.pk)
+        self._execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, caption) VALUES (%s, %s)',
+            (post.pk, post.caption),
+        )
+
+    def remove(self, post_id):
+        self._execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            (post_id,),
+        )
+
+    def rebuild(self):
+        quote = connection.ops.quote_name
+        with transaction.atomic():
+            self._execute(f'DELETE FROM {FTS_TABLE}')
+            self._execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, caption) '
+                f'SELECT {quote("id")}, {quote("caption")} '
+                f'FROM {quote(PostModel._meta.db_table)}'
+            )
+
+    def _read_alias(self):
+        return router.db_for_read(PostModel)
+
+    def count(self, terms):
+        return self._execute(
+            f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (self._match(terms),),
+            self._read_alias(),
+        )[0][0]
+
+    def ranked_ids(self, terms, offset, limit):
+        return [
+            row[0]
+            for row in self._execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY rank, rowid DESC LIMIT %s OFFSET %s',
+                (self._match(terms), limit, offset),
+                self._read_alias(),
+            )
+        ]
+
+
+class TermIndexBackend:
+    # Pure-Python fallback: the caption is tokenized here and stored as
+    # (term, post, frequency) rows, ranked by tf-idf on read.
+    def index(self, post):
+        with transaction.atomic():
+            self.remove(post.pk)
+            SearchTermModel.objects.bulk_create(self._terms(post))
+
+    def remove(self, post_id):
+        SearchTermModel.objects.filter(post=post_id).delete()
+
+    def rebuild(self, batch_size=500):
+        with transaction.atomic():
+            SearchTermModel.objects.all().delete()
+            terms = []
+            for post in PostModel.objects.only('pk', 'caption').iterator(
+                chunk_size=batch_size,
+            ):
+                terms.extend(self._terms(post))
+                if len(terms) >= batch_size:
+                    SearchTermModel.objects.bulk_create(terms)
+                    terms = []
+            SearchTermModel.objects.bulk_create(terms)
+
+    def _terms(self, post):
+        return [
+            SearchTermModel(
+                term=term,
+                post_id=post.pk,
+                frequency=frequency,
+            )
+            for term, frequency in Counter(tokenize(post.caption)).items()
+        ]
+
+    def _matches(self, terms):
+        return SearchTermModel.objects.filter(
+            term__in=terms,
+        ).order_by().values('post').annotate(
+            matched=Count('term'),
+        ).filter(
+            matched=len(terms),
+        )
+
+    def count(self, terms):
+        return self._matches(terms).count()
+
+    def ranked_ids(self, terms, offset, limit):
+        total = PostModel.objects.count()
+        frequencies = dict(
+            SearchTermModel.objects.filter(
+                term__in=terms,
+            ).order_by().values_list('term').annotate(Count('post'))
+        )
+        weights = [
+            When(
+                term=term,
+                then=Value(math.log(1 + total / frequencies.get(term, 1))),
+            )
+            for term in terms
+        ]
+        return list(
+            self._matches(terms).annotate(
+                score=Sum(
+                    Case(*weights, output_field=FloatField()) * F('frequency'),
+                ),
+            ).order_by(
+                '-score',
+                '-post',
+            ).values_list('post', flat=True)[offset:offset + limit]
+        )
+
+
+_backends = {}
+
+
+def get_backend():
+    alias = connection.alias
+    if alias not in _backends:
+        fts_ready = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+        _backends[alias] = FTS5Backend() if fts_ready else TermIndexBackend()
+    return _backends[alias]
+
+
+def index_post(post):
+    get_backend().index(post)
+
+
+def remove_post(post_id):
+    get_backend().remove(post_id)
+
+
+def rebuild_index():
+    get_backend().rebuild()
+
+
+class SearchResults:
+    # Lazy, sliceable result set so django.core.paginator.Paginator can
+    # page over it; only the requested slice of ids is fetched.
+    def __init__(self, query):
+        self.terms = sorted(set(tokenize(query)))
+        self.backend = get_backend()
+
+    def count(self):
+        if not self.terms:
+            return 0
+        return self.backend.count(self.terms)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        if not self.terms:
+            return []
+
+        offset = index.start or 0
+        ids = self.backend.ranked_ids(
+            self.terms,
+            offset,
+            index.stop - offset,
+        )
+        posts = PostModel.objects.select_related('user').in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(query):
+    return SearchResults(query)
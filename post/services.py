@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import fragments, like_buffer
+from .models import (
+    Post as PostModel,
+    Comment as CommentModel,
+    Like as LikeModel,
+)
+from utils.queries import delete_where, insert_or_ignore
+
+
+def liked_post_ids(user, post_ids):
+    if not user.is_authenticated or not post_ids:
+        return set()
+    return overlay_buffered_likes(
+        user,
+        post_ids,
+        LikeModel.objects.filter(
+            user=user,
+            post__in=post_ids,
+        ).values_list('post', flat=True),
+    )
+
+
+def overlay_buffered_likes(user, post_ids, liked):
+    if settings.LIKE_WRITE_BEHIND:
+        return like_buffer.buffer.overlay(user.pk, post_ids, liked)
+    return set(liked)
+
+
+def attach_is_liked(user, posts):
+    liked = liked_post_ids(user, [post.pk for post in posts])
+    for post in posts:
+        post.is_liked = post.pk in liked
+    return posts
+
+
+def like_post(user, post):
+    with transaction.atomic():
+        created = insert_or_ignore(
+            LikeModel,
+            user=user.pk,
+            post=post.pk,
+            created_at=timezone.now(),
+        )
+        if created:
+            PostModel.objects.filter(pk=post.pk).update(
+                likes_count=F('likes_count') + created,
+            )
+            fragments.bump_post(post.pk)
+    return bool(created)
+
+
+def unlike_post(user, post):
+    with transaction.atomic():
+        deleted = delete_where(
+            LikeModel,
+            user=user.pk,
+            post=post.pk,
+        )
+        if deleted:
+            PostModel.objects.filter(pk=post.pk).update(
+                likes_count=F('likes_count') - deleted,
+            )
+            fragments.bump_post(post.pk)
+    return bool(deleted)
+
+
+def buffer_like(user, post, like=None):
+    if like is None:
+        like = not liked_post_ids(user, [post.pk])
+    like_buffer.buffer.add(user.pk, post.pk, like)
+    return like
+
+
+def toggle_like(user, post, like=None):
+    # With an explicit target state each call is a single write; without one
+    # the delete row count decides whether to like instead.
+    if settings.LIKE_WRITE_BEHIND:
+        return buffer_like(user, post, like)
+    if like is None:
+        like = not unlike_post(user, post)
+        if like:
+            like_post(user, post)
+    elif like:
+        like_post(user, post)
+    else:
+        unlike_post(user, post)
+    return like
+
+
+def add_comment(comment):
+    # The comment and both counters commit together; the counters are
+    # bumped in SQL so concurrent comments never overwrite each other.
+    with transaction.atomic():
+        comment.save()
+        PostModel.objects.filter(pk=comment.post_id).update(
+            comments_count=F('comments_count') + 1,
+        )
+        if comment.reply_id:
+            CommentModel.objects.filter(pk=comment.reply_id).update(
+                replies_count=F('replies_count') + 1,
+            )
+    return comment
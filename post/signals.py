@@ -0,0 +1,39 @@
+from django.db.models import signals
+from django.dispatch import receiver
+
+from .models import (
+    Post as PostModel,
+    Comment as CommentModel,
+    Like as LikeModel,
+)
+from . import fragments, search
+
+
+@receiver(signals.post_save, sender=PostModel)
+def index_post(sender, **kwargs):
+    search.index_post(kwargs['instance'])
+
+
+@receiver(signals.post_delete, sender=PostModel)
+def remove_post(sender, **kwargs):
+    search.remove_post(kwargs['instance'].pk)
+
+
+@receiver(signals.post_save, sender=PostModel)
+@receiver(signals.post_delete, sender=PostModel)
+def invalidate_post_fragments(sender, **kwargs):
+    fragments.bump_post(kwargs['instance'].pk)
+
+
+@receiver(signals.post_save, sender=CommentModel)
+@receiver(signals.post_delete, sender=CommentModel)
+def invalidate_comment_fragments(sender, **kwargs):
+    comment = kwargs['instance']
+    fragments.bump_thread(comment.reply_id or comment.pk)
+    fragments.bump_post(comment.post_id)
+
+
+@receiver(signals.post_save, sender=LikeModel)
+@receiver(signals.post_delete, sender=LikeModel)
+def invalidate_like_fragments(sender, **kwargs):
+    fragments.bump_post(kwargs['instance'].post_id)
@@ -0,0 +1,8 @@
+from django.core.management import call_command
+
+from tasks.queue import task
+
+
+@task
+def repair_counters(batch_size=1000):
+    call_command('repair_counters', batch_size=batch_size)
@@ -1,3 +1,225 @@
-from django.test import TestCase
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User as UserModel
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from . import like_buffer, search, services
+from .models import (
+    Post as PostModel,
+    Like as LikeModel,
+)
+
+
+@override_settings(LIKE_WRITE_BEHIND=False)
+class LikeToggleTests(TestCase):
+    def setUp(self):
+        self.author = UserModel.objects.create_user('author', password='password')
+        self.reader = UserModel.objects.create_user('reader', password='password')
+        self.post = PostModel.objects.create(
+            user=self.author,
+            caption='first post',
+            slug='first-post',
+        )
+
+    def assertLikes(self, count):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, count)
+        self.assertEqual(LikeModel.objects.filter(post=self.post).count(), count)
+
+    def test_like_is_idempotent(self):
+        self.assertTrue(services.like_post(self.reader, self.post))
+        self.assertFalse(services.like_post(self.reader, self.post))
+        self.assertLikes(1)
+
+    def test_unlike_is_idempotent(self):
+        services.like_post(self.reader, self.post)
+        self.assertTrue(services.unlike_post(self.reader, self.post))
+        self.assertFalse(services.unlike_post(self.reader, self.post))
+        self.assertLikes(0)
+
+    def test_unlike_without_like_leaves_counter(self):
+        self.assertFalse(services.unlike_post(self.reader, self.post))
+        self.assertLikes(0)
+
+    def test_toggle_flips_state(self):
+        self.assertTrue(services.toggle_like(self.reader, self.post))
+        self.assertLikes(1)
+        self.assertFalse(services.toggle_like(self.reader, self.post))
+        self.assertLikes(0)
+        self.assertTrue(services.toggle_like(self.reader, self.post))
+        self.assertLikes(1)
+
+    def test_toggle_to_explicit_state_is_idempotent(self):
+        for _ in range(2):
+            self.assertTrue(services.toggle_like(self.reader, self.post, True))
+            self.assertLikes(1)
+        for _ in range(2):
+            self.assertFalse(services.toggle_like(self.reader, self.post, False))
+            self.assertLikes(0)
+
+    def test_counts_are_per_user(self):
+        services.like_post(self.reader, self.post)
+        services.like_post(self.author, self.post)
+        services.unlike_post(self.reader, self.post)
+        self.assertLikes(1)
+        self.assertEqual(
+            services.liked_post_ids(self.author, [self.post.pk]),
+            {self.post.pk},
+        )
+        self.assertEqual(services.liked_post_ids(self.reader, [self.post.pk]), set())
+
+
+@override_settings(LIKE_WRITE_BEHIND=True)
+class LikeBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = UserModel.objects.create_user('author', password='password')
+        self.reader = UserModel.objects.create_user('reader', password='password')
+        self.post = PostModel.objects.create(
+            user=self.author,
+            caption='first post',
+            slug='first-post',
+        )
+        # Long enough that only the explicit flushes below write anything.
+        self.buffer = like_buffer.LikeBuffer(3600, 1000, 60)
+        # Clicks a test left unflushed would otherwise be written at exit.
+        self.addCleanup(lambda: self.buffer.pending.clear())
+        patcher = mock.patch.object(like_buffer, 'buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertLikes(self, count):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, count)
+        self.assertEqual(LikeModel.objects.filter(post=self.post).count(), count)
+
+    def liked(self, user):
+        return services.liked_post_ids(user, [self.post.pk])
+
+    def test_overlay_shows_buffered_like(self):
+        self.assertTrue(services.toggle_like(self.reader, self.post))
+        self.assertLikes(0)
+        self.assertEqual(self.liked(self.reader), {self.post.pk})
+        self.assertEqual(self.liked(self.author), set())
+
+    def test_overlay_hides_buffered_unlike(self):
+        services.like_post(self.reader, self.post)
+        self.assertFalse(services.toggle_like(self.reader, self.post))
+        self.assertLikes(1)
+        self.assertEqual(self.liked(self.reader), set())
+
+    def test_flush_writes_rows_and_counter(self):
+        services.toggle_like(self.reader, self.post)
+        services.toggle_like(self.author, self.post)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertLikes(2)
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertLikes(2)
+        self.assertEqual(self.liked(self.reader), {self.post.pk})
+
+    def test_last_click_wins(self):
+        for _ in range(3):
+            services.toggle_like(self.reader, self.post)
+        self.assertEqual(self.liked(self.reader), {self.post.pk})
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertLikes(1)
+
+        services.toggle_like(self.reader, self.post)
+        services.toggle_like(self.reader, self.post, False)
+        self.buffer.flush()
+        self.assertLikes(0)
+
+    def test_flush_uses_state_from_other_workers(self):
+        services.toggle_like(self.reader, self.post, True)
+        # A click handled by another process only updates the shared state.
+        cache.set(like_buffer._state_key(self.reader.pk, self.post.pk), False)
+        self.buffer.flush()
+        self.assertLikes(0)
+
+    def test_flush_of_existing_state_keeps_counter(self):
+        services.like_post(self.reader, self.post)
+        services.toggle_like(self.reader, self.post, True)
+        self.buffer.flush()
+        self.assertLikes(1)
+
+    def test_failed_flush_keeps_clicks(self):
+        services.toggle_like(self.reader, self.post)
+        with mock.patch.object(like_buffer, 'apply_likes', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.buffer.flush()
+        self.assertLikes(0)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertLikes(1)
+
+
+@skipUnless(
+    search.FTS_TABLE in connection.introspection.table_names(),
+    'SQLite was built without FTS5',
+)
+class SearchBackendTests(TestCase):
+    captions = (
+        'Sunset over the sea',
+        'sunset, SUNSET and more sunset',
+        'Morning at the sea with coffee',
+        'coffee_time at the harbour',
+        'Nothing to see here',
+        'The sea, the sea!',
+        'Café crème by the sea',
+    )
+    queries = (
+        'sunset',
+        'SEA',
+        'the sea',
+        'coffee',
+        'coffee_time',
+        'sea coffee morning',
+        'harbour sunset',
+        'missing',
+        'cafe',
+        'CAFÉ crème',
+    )
+
+    def setUp(self):
+        user = UserModel.objects.create_user('author', password='password')
+        self.posts = [
+            PostModel.objects.create(user=user, caption=caption, slug='post')
+            for caption in self.captions
+        ]
+        self.fts = search.FTS5Backend()
+        self.terms = search.TermIndexBackend()
+        self.fts.rebuild()
+        self.terms.rebuild()
+
+    def assertSameResults(self):
+        for query in self.queries:
+            terms = sorted(set(search.tokenize(query)))
+            with self.subTest(query=query):
+                self.assertEqual(self.fts.count(terms), self.terms.count(terms))
+                self.assertEqual(
+                    set(self.fts.ranked_ids(terms, 0, 100)),
+                    set(self.terms.ranked_ids(terms, 0, 100)),
+                )
+
+    def test_rebuilt_indexes_agree(self):
+        self.assertSameResults()
+        self.assertEqual(self.fts.count(['sunset']), 2)
+        self.assertEqual(self.fts.count(['coffee', 'sea']), 1)
+
+    def test_indexes_agree_after_edits(self):
+        edited, removed = self.posts[4], self.posts[0]
+        edited.caption = 'Coffee by the sea at sunset'
+        for backend in (self.fts, self.terms):
+            backend.index(edited)
+            backend.remove(removed.pk)
+        self.assertSameResults()
+        self.assertEqual(self.terms.count(['sunset']), 2)
+
+    def test_most_frequent_match_ranks_first(self):
+        for backend in (self.fts, self.terms):
+            with self.subTest(backend=type(backend).__name__):
+                self.assertEqual(
+                    backend.ranked_ids(['sunset'], 0, 1),
+                    [self.posts[1].pk],
+                )
@@ -14,6 +14,11 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name='post_detail',
     ),
+    path(
+        'async/<int:post_id>/<slug:post_slug>/',
+        views.AsyncPostDetailView.as_view(),
+        name='post_detail_async',
+    ),
     path(
         'delete/<int:post_id>/',
         views.PostDeleteView.as_view(),
@@ -29,6 +34,16 @@ urlpatterns = [
         views.PostCommentReplyView.as_view(),
         name='reply_comment',
     ),
+    path(
+        'comments/<int:post_id>/',
+        views.PostCommentsView.as_view(),
+        name='post_comments',
+    ),
+    path(
+        'comment/replies/<int:comment_id>/',
+        views.CommentRepliesView.as_view(),
+        name='comment_replies',
+    ),
     path(
         'like/<int:post_id>/',
         views.PostLikeView.as_view(),
@@ -1,3 +1,7 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse, QueryDict
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views import View
@@ -5,15 +9,67 @@ from django.contrib import messages
 from django.utils.text import slugify
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.conf import settings
 
 from .models import (
     Post as PostModel,
     Comment as CommentModel,
-    Like as LikeModel,
 )
+from . import fragments, services
 from .forms import PostCreateForm, PostUpdateForm,\
     PostCommentForm, PostCommentReplyForm
+from media import feed, tasks as feed_tasks
+from utils.async_views import AsyncLoginRequiredMixin
+from utils.pagination import KeysetPaginator
 from utils.base_alerts import BaseAlert
+from utils.queries import first_pks_per_value
+
+
+def attach_replies(comments):
+    # Only the newest few replies of each thread are loaded, one extra to
+    # know whether the thread has more; the rest come from CommentRepliesView.
+    paginator = KeysetPaginator(settings.REPLIES_PREVIEW_COUNT)
+    replies = {comment.pk: [] for comment in comments}
+    if replies:
+        for reply in CommentModel.objects.filter(
+            pk__in=first_pks_per_value(
+                CommentModel,
+                'reply',
+                list(replies),
+                ('-created_at', '-id'),
+                paginator.per_page + 1,
+            ),
+        ).select_related('user').order_by('-created_at', '-id'):
+            replies[reply.reply_id].append(reply)
+
+    for comment in comments:
+        comment.reply_list = paginator.build_page(replies[comment.pk], QueryDict())
+    return comments
+
+
+def wants_json(request):
+    return (
+        request.GET.get('format') == 'json'
+        or 'application/json' in request.headers.get('Accept', '')
+    )
+
+
+def comment_data(comment):
+    return {
+        'id': comment.pk,
+        'user': comment.user.username,
+        'body': comment.body,
+        'created_at': comment.created_at.isoformat(),
+        'replies_count': comment.replies_count,
+    }
+
+
+def page_data(page):
+    return {
+        'results': [comment_data(comment) for comment in page],
+        'next_cursor': page.next_cursor,
+    }
 
 
 class PostCreateView(LoginRequiredMixin, View):
@@ -37,6 +93,10 @@ class PostCreateView(LoginRequiredMixin, View):
                 caption=form_data['caption'],
                 slug=slugify(form_data['caption'][:30]),
             )
+            # The author sees the post at once; followers get it from the
+            # fan-out task.
+            feed.fan_out_post(post, followers=False)
+            feed_tasks.fan_out.delay(post.pk)
             messages.success(
                 request,
                 BaseAlert.success_post_create,
@@ -58,7 +118,7 @@ class PostDetailView(LoginRequiredMixin, View):
 
     def setup(self, request, *args, **kwargs):
         self.post_instance = get_object_or_404(
-            PostModel,
+            PostModel.objects.select_related('user'),
             pk=kwargs['post_id'],
             slug=kwargs['post_slug'],
         )
@@ -66,10 +126,15 @@ class PostDetailView(LoginRequiredMixin, View):
 
     def get(self, request, *args, **kwargs):
         post = self.post_instance
-        comments = post.comments.all()
-        is_like = False
-        if post.is_like(request.user):
-            is_like = True
+        comments = KeysetPaginator(settings.COMMENTS_PER_PAGE).page(
+            post.comments.filter(
+                reply__isnull=True,
+            ).select_related('user'),
+            request.GET,
+        )
+        fragments.attach_post_versions([post])
+        fragments.attach_replies(comments.object_list, attach_replies)
+        services.attach_is_liked(request.user, [post])
 
         return render(
             request,
@@ -77,9 +142,10 @@ class PostDetailView(LoginRequiredMixin, View):
             {
                 'post': post,
                 'comments': comments,
+                'page': comments,
                 'form': self.form_class,
                 'reply_form': self.form_class_reply,
-                'is_like': is_like,
+                'is_like': post.is_liked,
             }
         )
 
@@ -90,7 +156,7 @@ class PostDetailView(LoginRequiredMixin, View):
             comment = form.save(commit=False)
             comment.user = request.user
             comment.post = self.post_instance
-            comment.save()
+            services.add_comment(comment)
             messages.success(
                 request,
                 BaseAlert.success_create_comment,
@@ -111,6 +177,108 @@ class PostDetailView(LoginRequiredMixin, View):
         )
 
 
+class AsyncPostDetailView(AsyncLoginRequiredMixin, View):
+    template_name = 'post/post_detail.html'
+    form_class = PostCommentForm
+    form_class_reply = PostCommentReplyForm
+
+    async def get(self, request, post_id, post_slug):
+        # The post, its first comments and the like check only need the ids
+        # from the URL, so they are read at once; a missing post still 404s.
+        post, comments, is_like = await asyncio.gather(
+            PostModel.objects.select_related('user').filter(
+                pk=post_id,
+                slug=post_slug,
+            ).afirst(),
+            KeysetPaginator(settings.COMMENTS_PER_PAGE).apage(
+                CommentModel.objects.filter(
+                    post=post_id,
+                    reply__isnull=True,
+                ).select_related('user'),
+                request.GET,
+            ),
+            request.user.likes.filter(post=post_id).aexists(),
+        )
+        if post is None:
+            raise Http404
+        is_like = post_id in services.overlay_buffered_likes(
+            request.user,
+            [post_id],
+            [post_id] if is_like else [],
+        )
+
+        return await sync_to_async(self.render_page)(
+            request,
+            {
+                'post': post,
+                'comments': comments,
+                'page': comments,
+                'form': self.form_class,
+                'reply_form': self.form_class_reply,
+                'is_like': is_like,
+            },
+        )
+
+    def render_page(self, request, context):
+        fragments.attach_post_versions([context['post']])
+        fragments.attach_replies(context['comments'].object_list, attach_replies)
+        return render(request, self.template_name, context)
+
+
+class PostCommentsView(LoginRequiredMixin, View):
+    template_name = 'post/inc/comments.html'
+
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            PostModel,
+            pk=post_id,
+        )
+        comments = KeysetPaginator(settings.COMMENTS_PER_PAGE).page(
+            post.comments.filter(
+                reply__isnull=True,
+            ).select_related('user'),
+            request.GET,
+        )
+        if wants_json(request):
+            return JsonResponse(page_data(comments))
+
+        fragments.attach_replies(comments.object_list, attach_replies)
+        return render(
+            request,
+            self.template_name,
+            {
+                'post': post,
+                'comments': comments,
+                'reply_form': PostCommentReplyForm,
+            }
+        )
+
+
+class CommentRepliesView(LoginRequiredMixin, View):
+    template_name = 'post/inc/replies.html'
+
+    def get(self, request, comment_id):
+        comment = get_object_or_404(
+            CommentModel,
+            pk=comment_id,
+        )
+        replies = KeysetPaginator(settings.REPLIES_PER_PAGE).page(
+            comment.comments.select_related('user'),
+            request.GET,
+        )
+        if wants_json(request):
+            return JsonResponse(page_data(replies))
+
+        return render(
+            request,
+            self.template_name,
+            {
+                'comment': comment,
+                'replies': replies,
+            }
+        )
+
+
 class PostDeleteView(LoginRequiredMixin, View):
     template_name = 'media:home'
 
@@ -237,7 +405,7 @@ class PostCommentReplyView(LoginRequiredMixin, View):
             reply_comment.post = post
             reply_comment.is_reply = True
             reply_comment.reply = comment
-            reply_comment.save()
+            services.add_comment(reply_comment)
             messages.success(
                 request,
                 BaseAlert.success_create_comment,
@@ -259,27 +427,28 @@ class PostCommentReplyView(LoginRequiredMixin, View):
 
 
 class PostLikeView(LoginRequiredMixin, View):
-    def get(self, request, post_id):
+    actions = {
+        'like': True,
+        'unlike': False,
+    }
+
+    def post(self, request, post_id):
         post = get_object_or_404(
             PostModel,
             pk=post_id,
         )
-        is_liked = LikeModel.objects.filter(
-            user=request.user,
-            post=post.pk,
-        )
-        if is_liked:
-            is_liked.delete()
-            return redirect(
-                'posts:post_detail',
-                post.id,
-                post.slug,
-            )
-
-        LikeModel.objects.create(
-            user=request.user,
-            post=post,
+        services.toggle_like(
+            request.user,
+            post,
+            self.actions.get(request.POST.get('action')),
         )
+        next_url = request.POST.get('next')
+        if next_url and url_has_allowed_host_and_scheme(
+            next_url,
+            allowed_hosts={request.get_host()},
+            require_https=request.is_secure(),
+        ):
+            return redirect(next_url)
         return redirect(
             'posts:post_detail',
             post.id,
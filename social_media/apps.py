@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class SocialMediaConfig(AppConfig):
+    name = 'social_media'
+
+    def ready(self):
+        from django.core.checks import Tags, register
+        from django.db.backends.signals import connection_created
+        from .checks import check_shared_caches
+        from .db import configure_sqlite
+
+        register(check_shared_caches, Tags.caches)
+        connection_created.connect(
+            configure_sqlite,
+            dispatch_uid='social_media.db.configure_sqlite',
+        )
@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from utils.templates import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media.settings')
 
 application = get_asgi_application()
+warm_up()
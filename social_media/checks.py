@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.checks import Error
+
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def is_process_local(alias):
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES
+
+
+def check_shared_caches(app_configs, **kwargs):
+    # A logout or a password change only clears the cache of the worker
+    # that handled it; other workers would keep the old session or user.
+    # Buffered likes would only be visible to the worker that took them.
+    errors = []
+    if not is_process_local('default'):
+        return errors
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        errors.append(Error(
+            f'{settings.SESSION_ENGINE} needs a shared default cache.',
+            hint='Set CACHE_URL or use the db session engine.',
+            id='social_media.E001',
+        ))
+    if settings.USER_CACHE:
+        errors.append(Error(
+            'USER_CACHE needs a shared default cache.',
+            hint='Set CACHE_URL or turn USER_CACHE off.',
+            id='social_media.E002',
+        ))
+    if settings.LIKE_WRITE_BEHIND:
+        errors.append(Error(
+            'LIKE_WRITE_BEHIND needs a shared default cache.',
+            hint='Set CACHE_URL or turn LIKE_WRITE_BEHIND off.',
+            id='social_media.E003',
+        ))
+    return errors
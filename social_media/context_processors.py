@@ -0,0 +1,10 @@
+from . import routers
+
+
+def fragment_cache(request):
+    # Rows read from a lagging replica may be older than the fragment version
+    # bumped on commit, so fragments rendered from them are never stored;
+    # the replica read still uses fragments stored by primary reads.
+    if routers.reading_replica():
+        return {'fragment_cache': 'template_fragments_readonly'}
+    return {'fragment_cache': 'template_fragments'}
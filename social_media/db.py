@@ -0,0 +1,18 @@
+import os
+
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    # connection_created receiver. The pragmas go through the raw sqlite3
+    # connection so they are not counted as queries by the hot path wrappers.
+    if connection.vendor != 'sqlite':
+        return
+    tracked = os.fspath(connection.settings_dict['NAME']) in map(
+        os.fspath,
+        settings.SQLITE_TRACKED_DATABASES,
+    )
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        if tracked and name == 'journal_mode':
+            continue
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,193 @@
+import json
+import math
+import os
+import socket
+import tempfile
+import threading
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template import base as template_base
+
+
+PERCENTILES = (50, 95, 99)
+METRICS = ('wall_ms', 'queries', 'db_ms', 'template_ms')
+
+_current_sample = ContextVar('hot_path_sample', default=None)
+
+
+def percentile(values, rank):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(math.ceil(rank / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class RequestSample:
+    def __init__(self, method):
+        self.method = method
+        self.view_name = None
+        self.status = None
+        self.wall_time = 0.0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.statements = []
+        self.rendering = False
+
+    @property
+    def queries(self):
+        return len(self.statements)
+
+    def as_row(self):
+        return (
+            self.view_name,
+            round(self.wall_time * 1000, 3),
+            self.queries,
+            round(self.db_time * 1000, 3),
+            round(self.template_time * 1000, 3),
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook: counts and times every statement.
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.statements.append(sql)
+
+
+class HotPathStats:
+    def __init__(self, size):
+        self.rows = deque(maxlen=size)
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, sample):
+        with self.lock:
+            self.rows.append(sample.as_row())
+            self.recorded += 1
+            every = settings.HOT_PATH_SNAPSHOT_EVERY
+            if every and self.recorded % every == 0:
+                self.snapshot()
+
+    def reset(self):
+        with self.lock:
+            self.rows.clear()
+
+    def snapshot(self):
+        # One file per worker, replaced atomically so a reader never sees a
+        # partial write.
+        directory = settings.HOT_PATH_SNAPSHOT_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{socket.gethostname()}-{os.getpid()}.json'
+        with tempfile.NamedTemporaryFile(
+            'w',
+            dir=directory,
+            suffix='.tmp',
+            delete=False,
+        ) as file:
+            json.dump(list(self.rows), file)
+        os.replace(file.name, path)
+
+    def summary(self):
+        with self.lock:
+            rows = list(self.rows)
+        return summarize(rows)
+
+
+def summarize(rows):
+    views = {}
+    for view_name, *values in rows:
+        columns = views.setdefault(view_name, [[] for _ in METRICS])
+        for column, value in zip(columns, values):
+            column.append(value)
+
+    return {
+        'requests': len(rows),
+        'views': {
+            view_name: {
+                'count': len(columns[0]),
+                **{
+                    metric: {
+                        f'p{rank}': percentile(column, rank)
+                        for rank in PERCENTILES
+                    }
+                    for metric, column in zip(METRICS, columns)
+                },
+            }
+            for view_name, columns in sorted(views.items())
+        },
+    }
+
+
+def _snapshot_paths():
+    directory = settings.HOT_PATH_SNAPSHOT_DIR
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob('*.json'))
+
+
+def load_snapshots():
+    rows = []
+    for path in _snapshot_paths():
+        with path.open() as file:
+            rows.extend(json.load(file))
+    return rows
+
+
+def clear_snapshots():
+    for path in _snapshot_paths():
+        path.unlink(missing_ok=True)
+
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, context):
+        sample = _current_sample.get()
+        if sample is None or sample.rendering:
+            return render(self, context)
+
+        sample.rendering = True
+        start = perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            sample.template_time += perf_counter() - start
+            sample.rendering = False
+
+    wrapper.hot_path_timed = True
+    return wrapper
+
+
+def install_template_timer():
+    # Only the outermost render of a request is timed, so {% include %} and
+    # {% extends %} are not counted twice.
+    if not getattr(template_base.Template.render, 'hot_path_timed', False):
+        template_base.Template.render = _timed_render(
+            template_base.Template.render,
+        )
+
+
+def start_sample(method):
+    sample = RequestSample(method)
+    return sample, _current_sample.set(sample)
+
+
+def finish_sample(token):
+    _current_sample.reset(token)
+
+
+def wrap_connections(stack, sample):
+    # Connections are per thread, so this has to run on the thread that
+    # executes the request's queries.
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(sample))
+
+
+stats = HotPathStats(settings.HOT_PATH_BUFFER_SIZE)
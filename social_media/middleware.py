@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from . import metrics, routers
+
+
+logger = logging.getLogger('social_media.hotpath')
+
+
+class HotPathMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Same marker django.utils.deprecation.MiddlewareMixin sets, so
+            # the handler keeps the whole chain async under ASGI.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        metrics.install_template_timer()
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        sample, token = metrics.start_sample(request.method)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                metrics.wrap_connections(stack, sample)
+                response = self.get_response(request)
+        finally:
+            sample.wall_time = perf_counter() - start
+            metrics.finish_sample(token)
+
+        self.record(request, response, sample)
+        return response
+
+    async def __acall__(self, request):
+        # ORM calls of an async request run on its thread-sensitive
+        # executor, which is where the wrappers have to be installed.
+        sample, token = metrics.start_sample(request.method)
+        start = perf_counter()
+        stack = ExitStack()
+        try:
+            await sync_to_async(metrics.wrap_connections)(stack, sample)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            sample.wall_time = perf_counter() - start
+            metrics.finish_sample(token)
+
+        self.record(request, response, sample)
+        return response
+
+    def record(self, request, response, sample):
+        match = request.resolver_match
+        sample.view_name = match.view_name if match else '<unresolved>'
+        sample.status = response.status_code
+        metrics.stats.record(sample)
+
+        budget = settings.HOT_PATH_QUERY_BUDGET
+        if budget and sample.queries > budget:
+            logger.warning(
+                '%s %s ran %s queries (budget %s):\n%s',
+                request.method,
+                sample.view_name,
+                sample.queries,
+                budget,
+                '\n'.join(sample.statements),
+            )
+
+
+class ReplicaRoutingMiddleware:
+    # GET/HEAD requests to the views in REPLICA_READ_VIEWS read from a
+    # replica. A request that wrote to the primary, whatever its method,
+    # marks the client with a cookie that keeps its reads on the primary for
+    # REPLICA_STICKY_SECONDS, so it sees its own writes despite replication
+    # lag. Writes are seen through ReplicaRouter.db_for_write.
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        token = self.route(request)
+        writes, writes_token = routers.track_writes()
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.stop_tracking_writes(writes_token)
+            if token is not None:
+                routers.reset_replica(token)
+        return self.stick(writes, response)
+
+    async def __acall__(self, request):
+        token = self.route(request)
+        writes, writes_token = routers.track_writes()
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.stop_tracking_writes(writes_token)
+            if token is not None:
+                routers.reset_replica(token)
+        return self.stick(writes, response)
+
+    def route(self, request):
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in self.safe_methods
+            or settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        ):
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.view_name not in settings.REPLICA_READ_VIEWS:
+            return None
+        return routers.use_replica()
+
+    def stick(self, writes, response):
+        if settings.DATABASE_REPLICAS and writes.happened:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,63 @@
+import json
+import resource
+import sys
+from importlib import import_module
+from time import perf_counter
+from wsgiref.util import setup_testing_defaults
+
+
+# Run in a fresh interpreter by the measure_startup command:
+#   python -m social_media.probe <wsgi module> <path>
+# Only the standard library is imported before the clock starts.
+
+
+def rss_mb():
+    # Current resident set where /proc exists, otherwise the peak so far.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def main(module, path):
+    start = perf_counter()
+    application = import_module(module).application
+    boot = perf_counter() - start
+    boot_rss = rss_mb()
+
+    from django.conf import settings
+
+    hosts = [host for host in settings.ALLOWED_HOSTS if '*' not in host]
+    environ = {
+        'PATH_INFO': path,
+        'HTTP_HOST': hosts[0] if hosts else 'localhost',
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    start = perf_counter()
+    response = application(environ, lambda status, headers: statuses.append(status))
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    first_request = perf_counter() - start
+
+    print(json.dumps({
+        'boot_ms': round(boot * 1000, 3),
+        'first_request_ms': round(first_request * 1000, 3),
+        'status': statuses[0].split()[0],
+        'boot_rss_mb': round(boot_rss, 1),
+        'rss_mb': round(rss_mb(), 1),
+    }))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,68 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+_writes = ContextVar('primary_writes', default=None)
+
+# Session rows are rewritten on login and logout, so they are always read
+# where they were written. Users, profiles and relations fill shared caches
+# (cached users, following sets, pull authors) that outlive replication
+# lag, so they are read from the primary as well.
+PRIMARY_ONLY_APPS = ('sessions', 'auth', 'accounts')
+# Writes to these do not make the client stick to the primary.
+UNTRACKED_WRITE_APPS = ('sessions',)
+
+
+def use_replica():
+    # Returns a token for reset_replica(); without replicas reads stay on
+    # the primary.
+    replicas = settings.DATABASE_REPLICAS
+    return _read_alias.set(random.choice(replicas) if replicas else None)
+
+
+def reset_replica(token):
+    _read_alias.reset(token)
+
+
+def reading_replica():
+    return _read_alias.get() is not None
+
+
+class PrimaryWrites:
+    # Mutable so that writes made in threads running sync_to_async, which
+    # get a copy of the request context, are seen by the request.
+    def __init__(self):
+        self.happened = False
+
+
+def track_writes():
+    # Returns the tracker and a token for stop_tracking_writes().
+    writes = PrimaryWrites()
+    return writes, _writes.set(writes)
+
+
+def stop_tracking_writes(token):
+    _writes.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None and model._meta.app_label not in UNTRACKED_WRITE_APPS:
+            writes.happened = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
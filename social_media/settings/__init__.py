@@ -0,0 +1,15 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+# DJANGO_ENV picks the profile. DJANGO_SETTINGS_MODULE may also name
+# social_media.settings.dev or social_media.settings.prod directly.
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'dev')
+
+if DJANGO_ENV == 'prod':
+    from .prod import *
+elif DJANGO_ENV == 'dev':
+    from .dev import *
+else:
+    raise ImproperlyConfigured(f'Unknown DJANGO_ENV {DJANGO_ENV!r}; use dev or prod.')
@@ -0,0 +1,353 @@
+"""
+Django settings for social_media project, shared by the dev and prod
+profiles. social_media.settings picks one from DJANGO_ENV.
+
+Generated by 'django-admin startproject' using Django 4.1.1.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/4.1/ref/settings/
+"""
+
+import os
+from pathlib import Path
+from utils.GOOGLE_RESET_PASS_CONFIG import (
+    EMAIL_HOST,
+    EMAIL_HOST_USER,
+    EMAIL_PORT,
+    EMAIL_HOST_PASSWORD,
+    EMAIL_USE_TLS,
+    DEFAULT_FROM_EMAIL,
+)
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/4.1/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'django-insecure-7b*6rofd5cfdm$m4urszfa(m^a7jhc%m4cvgzd(b==3&r@9fed'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'social_media.apps.SocialMediaConfig',
+    'media.apps.MediaConfig',
+    'accounts.apps.AccountsConfig',
+    'post.apps.PostConfig',
+    'tasks.apps.TasksConfig',
+]
+
+MIDDLEWARE = [
+    'social_media.middleware.HotPathMiddleware',
+    'social_media.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'social_media.urls'
+
+# Parsed templates are kept for the process lifetime when TEMPLATE_CACHE is
+# on, the default outside the dev profile. TEMPLATE_WARMUP parses all of them
+# when the WSGI/ASGI application loads, so first requests skip compilation.
+TEMPLATE_CACHE = os.environ.get('TEMPLATE_CACHE', '1') == '1'
+TEMPLATE_WARMUP = TEMPLATE_CACHE and os.environ.get('TEMPLATE_WARMUP', '1') == '1'
+
+
+def template_settings(cache, debug=False):
+    loaders = [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]
+    if cache:
+        loaders = [
+            ('django.template.loaders.cached.Loader', loaders),
+        ]
+    context_processors = [
+        'django.template.context_processors.request',
+        'django.contrib.auth.context_processors.auth',
+        'django.contrib.messages.context_processors.messages',
+        'social_media.context_processors.fragment_cache',
+    ]
+    if debug:
+        context_processors.insert(0, 'django.template.context_processors.debug')
+    return [
+        {
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [BASE_DIR / 'templates'],
+            'OPTIONS': {
+                'loaders': loaders,
+                'context_processors': context_processors,
+            },
+        },
+    ]
+
+
+TEMPLATES = template_settings(TEMPLATE_CACHE)
+
+WSGI_APPLICATION = 'social_media.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/4.1/ref/settings/#databases
+
+# DATABASE_ENGINE=postgresql switches to PostgreSQL (needs psycopg2). Set
+# POSTGRES_POOLED when connecting through a transaction-pooling pgbouncer.
+if os.environ.get('DATABASE_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'social_media'),
+            'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': bool(os.environ.get('POSTGRES_POOLED')),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+# Read replicas. DATABASE_REPLICA_PATHS (SQLite files, e.g. refreshed with
+# the sync_replicas command) or POSTGRES_REPLICA_HOSTS, comma separated.
+DATABASE_REPLICAS = []
+if os.environ.get('DATABASE_ENGINE') == 'postgresql':
+    replica_field, replicas = 'HOST', os.environ.get('POSTGRES_REPLICA_HOSTS', '')
+else:
+    replica_field, replicas = 'NAME', os.environ.get('DATABASE_REPLICA_PATHS', '')
+for index, replica in enumerate(filter(None, replicas.split(','))):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        replica_field: replica,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['social_media.routers.ReplicaRouter']
+REPLICA_READ_VIEWS = (
+    'media:home',
+    'media:home_async',
+    'posts:post_detail',
+    'posts:post_detail_async',
+    'posts:post_comments',
+    'posts:comment_replies',
+    'accounts:user_profile',
+    'accounts:user_profile_async',
+)
+REPLICA_STICKY_COOKIE = 'use_primary'
+REPLICA_STICKY_SECONDS = 5
+
+# Applied to every new SQLite connection by social_media.db.configure_sqlite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+# journal_mode is stored in the database header, so it is not changed on
+# the development database committed to the repository.
+SQLITE_TRACKED_DATABASES = (BASE_DIR / 'db.sqlite3',)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+# Sessions, cached users, fragments and the follow graph must be shared by
+# every worker, so multi-process deployments set CACHE_URL to a Redis server
+# (redis://host:6379/0, needs the redis package) sized with maxmemory and
+# an allkeys-lru policy. Without it the cache is per process, which only
+# suits a single dev server; sessions and users then come from the database.
+CACHE_URL = os.environ.get('CACHE_URL', '')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'default',
+        },
+        # Fragment versions are bumped by whichever worker handled the
+        # write, so the fragments have to live where every worker reads.
+        'template_fragments': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'fragments',
+            'TIMEOUT': None,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'default',
+            'OPTIONS': {
+                'MAX_ENTRIES': 100000,
+            },
+        },
+        'template_fragments': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'template_fragments',
+            'TIMEOUT': None,
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+        },
+    }
+
+# Requests reading from a replica use the stored fragments but never store
+# one; see social_media.context_processors.fragment_cache.
+CACHES['template_fragments_readonly'] = {
+    'BACKEND': 'utils.cache.ReadOnlyCache',
+    'LOCATION': 'template_fragments',
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/4.1/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/4.1/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+AUTHENTICATION_BACKENDS = [
+    'accounts.authentications.CachedModelBackend',
+    'accounts.authentications.EmailBackend',
+]
+
+# Sessions are read from the cache and written through to the database,
+# and request.user comes from the cache, only when the cache is shared;
+# social_media.checks refuses either on a per-process cache.
+if CACHE_URL:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+USER_CACHE = bool(CACHE_URL)
+USER_CACHE_TIMEOUT = 60 * 15
+
+# Follow graph cache; entries also expire so missed updates heal.
+GRAPH_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Google reset password config
+EMAIL_BACKEND = 'utils.mail.PooledEmailBackend'
+EMAIL_HOST = EMAIL_HOST
+EMAIL_HOST_USER = EMAIL_HOST_USER
+EMAIL_PORT = EMAIL_PORT
+EMAIL_HOST_PASSWORD = EMAIL_HOST_PASSWORD
+EMAIL_USE_TLS = EMAIL_USE_TLS
+DEFAULT_FROM_EMAIL = DEFAULT_FROM_EMAIL
+EMAIL_TIMEOUT = 10
+
+# Pooled SMTP connections, per process and server account.
+EMAIL_POOL_SIZE = 2
+EMAIL_POOL_IDLE_TIMEOUT = 60
+EMAIL_POOL_MAX_MESSAGES = 100
+EMAIL_BATCH_SIZE = 20
+
+# Background tasks are rows in tasks_task, run by `manage.py run_tasks`.
+# Failed tasks are retried after TASKS_RETRY_DELAY seconds, doubling each
+# time; TASKS_EAGER runs them in-process on commit instead.
+TASKS_EAGER = False
+TASKS_WORKERS = 4
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_DELAY = 10
+TASKS_RETRY_MAX_DELAY = 60 * 60
+TASKS_LOCK_TIMEOUT = 60 * 10
+
+# Home timeline
+FEED_PAGE_SIZE = 20
+FEED_MAX_LENGTH = 800
+FEED_FANOUT_FOLLOWER_LIMIT = 1000
+# The cached set of authors over that limit is reloaded at least this often.
+FEED_PULL_AUTHORS_TIMEOUT = 60 * 5
+
+# Likes are written behind a buffer when enabled; pending clicks are
+# flushed every LIKE_FLUSH_INTERVAL_MS or LIKE_FLUSH_MAX_EVENTS. Each click
+# state stays in the shared default cache for LIKE_STATE_TIMEOUT seconds,
+# so every worker reads it until the flush has reached the table.
+LIKE_WRITE_BEHIND = False
+LIKE_FLUSH_INTERVAL_MS = 200
+LIKE_FLUSH_MAX_EVENTS = 500
+LIKE_STATE_TIMEOUT = 60
+
+# Pagination
+POSTS_PER_PAGE = 20
+COMMENTS_PER_PAGE = 20
+REPLIES_PER_PAGE = 20
+REPLIES_PREVIEW_COUNT = 3
+SEARCH_RESULTS_PER_PAGE = 20
+
+# Per-view hot path instrumentation
+HOT_PATH_BUFFER_SIZE = 5000
+HOT_PATH_QUERY_BUDGET = 50
+HOT_PATH_SNAPSHOT_EVERY = 100
+# Every worker writes its snapshot to a file here, which `manage.py hotpaths`
+# reads back, so point all workers of a deployment at the same directory.
+HOT_PATH_SNAPSHOT_DIR = Path(
+    os.environ.get('HOT_PATH_SNAPSHOT_DIR', BASE_DIR / 'var' / 'hotpaths')
+)
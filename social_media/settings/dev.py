@@ -0,0 +1,12 @@
+import os
+
+from .base import *
+
+
+DEBUG = True
+
+# Templates are re-read on every render so edits show up without the
+# autoreloader; TEMPLATE_CACHE=1 turns the cached loader back on.
+TEMPLATE_CACHE = os.environ.get('TEMPLATE_CACHE', '0') == '1'
+TEMPLATE_WARMUP = TEMPLATE_CACHE and TEMPLATE_WARMUP
+TEMPLATES = template_settings(TEMPLATE_CACHE, debug=True)
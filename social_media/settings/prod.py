@@ -0,0 +1,31 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *
+
+
+# With DEBUG every connection keeps each executed query in
+# connection.queries, which grows with traffic; base already leaves out the
+# debug context processor.
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY for the prod settings.')
+
+if not CACHE_URL:
+    raise ImproperlyConfigured(
+        'Set CACHE_URL for the prod settings; every worker has to share the '
+        'session, user and graph caches.'
+    )
+
+ALLOWED_HOSTS = [
+    host
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host
+]
+
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', EMAIL_HOST_USER)
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', EMAIL_HOST_PASSWORD)
@@ -16,8 +16,15 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from . import views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(
+        'hotpaths/',
+        views.hot_path_stats,
+        name='hot_path_stats',
+    ),
     path(
         '',
         include('media.urls', namespace='media'),
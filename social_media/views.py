@@ -0,0 +1,11 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from . import metrics
+
+
+@staff_member_required
+def hot_path_stats(request):
+    if request.GET.get('reset'):
+        metrics.stats.reset()
+    return JsonResponse(metrics.stats.summary())
@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from utils.templates import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media.settings')
 
 application = get_wsgi_application()
+warm_up()
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import Task as TaskModel
+
+
+@admin.register(TaskModel)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'created_at',
+    )
+    search_fields = (
+        'name',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
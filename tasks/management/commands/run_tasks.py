@@ -0,0 +1,80 @@
+import signal
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks import queue
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks on a thread pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.TASKS_WORKERS,
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help='Seconds to wait between polls when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no task is due instead of polling.',
+        )
+
+    def handle(self, *args, **options):
+        self.stopped = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stopped.set())
+        worker_id = uuid.uuid4().hex
+        workers = options['workers']
+        poll_interval = options['poll_interval']
+        self.counts = {True: 0, False: 0}
+        running = set()
+
+        with ThreadPoolExecutor(workers, thread_name_prefix='task') as executor:
+            try:
+                while not self.stopped.is_set():
+                    queue.release_stale(settings.TASKS_LOCK_TIMEOUT)
+                    if len(running) < workers:
+                        claimed = queue.claim(workers - len(running), worker_id)
+                        close_old_connections()
+                        running.update(
+                            executor.submit(queue.execute, task) for task in claimed
+                        )
+                    if not running:
+                        if options['once']:
+                            break
+                        self.stopped.wait(poll_interval)
+                        continue
+                    # Poll again as soon as a slot frees up, or after the
+                    # interval when every slot is still busy.
+                    done, running = wait(
+                        running,
+                        timeout=poll_interval,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    self.collect(done)
+            except KeyboardInterrupt:
+                pass
+            # In-flight tasks finish before the pool shuts down.
+            self.collect(running)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{self.counts[True]} tasks done, {self.counts[False]} failed'
+            )
+        )
+
+    def collect(self, futures):
+        for future in futures:
+            self.counts[future.result()] += 1
@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        FAILED = 'failed'
+
+    name = models.CharField(
+        max_length=200,
+    )
+    args = models.JSONField(
+        default=list,
+    )
+    kwargs = models.JSONField(
+        default=dict,
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=1,
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+    )
+    locked_by = models.CharField(
+        max_length=32,
+        blank=True,
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        blank=True,
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        ordering = (
+            'run_at',
+            'pk',
+        )
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='tasks_task_status_run_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
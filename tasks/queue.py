@@ -0,0 +1,146 @@
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task as TaskModel
+
+
+logger = logging.getLogger('tasks')
+
+Status = TaskModel.Status
+
+
+def task(func=None, *, max_attempts=None):
+    # Registers a module-level function as a task; `func.delay(...)` enqueues
+    # it. Arguments are stored as JSON, so pass ids rather than instances.
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts or settings.TASKS_MAX_ATTEMPTS
+        func.delay = partial(enqueue, func)
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def enqueue(func, *args, **kwargs):
+    if settings.TASKS_EAGER:
+        transaction.on_commit(partial(func, *args, **kwargs))
+        return None
+    # The row is part of the caller's transaction: a rolled back request
+    # never leaves a task behind, and workers only see committed rows.
+    return TaskModel.objects.create(
+        name=func.task_name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=func.max_attempts,
+    )
+
+
+def resolve(name):
+    func = import_string(name)
+    if getattr(func, 'task_name', None) != name:
+        raise ValueError(f'{name} is not a registered task')
+    return func
+
+
+def due_ids(limit, now):
+    return list(
+        TaskModel.objects.filter(
+            status=Status.PENDING,
+            run_at__lte=now,
+        ).order_by('run_at', 'pk').values_list('pk', flat=True)[:limit]
+    )
+
+
+def lock(ids, worker_id, now):
+    # A conditional UPDATE on the pending status, so of several workers that
+    # read the same due ids only one gets each row, on any backend.
+    TaskModel.objects.filter(
+        pk__in=ids,
+        status=Status.PENDING,
+    ).update(
+        status=Status.RUNNING,
+        locked_by=worker_id,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(
+        TaskModel.objects.filter(
+            pk__in=ids,
+            status=Status.RUNNING,
+            locked_by=worker_id,
+        )
+    )
+
+
+def claim(limit, worker_id=None):
+    worker_id = worker_id or uuid.uuid4().hex
+    now = timezone.now()
+    ids = due_ids(limit, now)
+    if not ids:
+        return []
+    return lock(ids, worker_id, now)
+
+
+def release_stale(timeout):
+    # Tasks left running by a worker that died go back to the queue; the
+    # attempt they used still counts.
+    stale = TaskModel.objects.filter(
+        status=Status.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    failed = stale.filter(
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=Status.FAILED,
+        last_error='Worker lock expired',
+    )
+    return failed + stale.update(
+        status=Status.PENDING,
+        locked_by='',
+        locked_at=None,
+    )
+
+
+def retry_delay(attempts):
+    return min(
+        settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.TASKS_RETRY_MAX_DELAY,
+    )
+
+
+def execute(task):
+    try:
+        resolve(task.name)(*task.args, **task.kwargs)
+    except Exception:
+        logger.exception('Task %s (%s) failed', task.pk, task.name)
+        error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            TaskModel.objects.filter(pk=task.pk).update(
+                status=Status.FAILED,
+                last_error=error,
+            )
+            return False
+        TaskModel.objects.filter(pk=task.pk).update(
+            status=Status.PENDING,
+            locked_by='',
+            locked_at=None,
+            run_at=timezone.now() + timedelta(seconds=retry_delay(task.attempts)),
+            last_error=error,
+        )
+        return False
+    else:
+        TaskModel.objects.filter(pk=task.pk).delete()
+        return True
+    finally:
+        close_old_connections()
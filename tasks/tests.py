@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User as UserModel
+from django.core import mail
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import queue
+from .models import Task as TaskModel
+
+
+Status = TaskModel.Status
+
+calls = []
+
+
+@queue.task(max_attempts=3)
+def record(value):
+    calls.append(value)
+
+
+@queue.task(max_attempts=3)
+def fail():
+    raise RuntimeError('task failed')
+
+
+# queue.execute() closes old connections, which a TestCase transaction does
+# not survive.
+@override_settings(
+    TASKS_EAGER=False,
+    TASKS_RETRY_DELAY=10,
+    TASKS_RETRY_MAX_DELAY=25,
+)
+class TaskQueueTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def claim_one(self, worker_id='worker'):
+        tasks = queue.claim(10, worker_id)
+        self.assertEqual(len(tasks), 1)
+        return tasks[0]
+
+    def test_enqueue_stores_task(self):
+        task = record.delay(1)
+        self.assertEqual(task.name, 'tasks.tests.record')
+        self.assertEqual(task.args, [1])
+        self.assertEqual(task.status, Status.PENDING)
+        self.assertEqual(task.max_attempts, 3)
+
+    def test_claim_locks_due_tasks(self):
+        due = record.delay(1)
+        later = record.delay(2)
+        TaskModel.objects.filter(pk=later.pk).update(
+            run_at=timezone.now() + timedelta(hours=1),
+        )
+        task = self.claim_one()
+        self.assertEqual(task.pk, due.pk)
+        self.assertEqual(task.status, Status.RUNNING)
+        self.assertEqual(task.locked_by, 'worker')
+        self.assertEqual(task.attempts, 1)
+        self.assertEqual(queue.claim(10, 'other'), [])
+
+    def test_double_claim(self):
+        # Both workers read the same due ids; only the first lock wins.
+        task = record.delay(1)
+        now = timezone.now()
+        ids = queue.due_ids(10, now)
+        self.assertEqual(queue.due_ids(10, now), ids)
+        self.assertEqual(len(queue.lock(ids, 'first', now)), 1)
+        self.assertEqual(queue.lock(ids, 'second', now), [])
+        task.refresh_from_db()
+        self.assertEqual(task.locked_by, 'first')
+        self.assertEqual(task.attempts, 1)
+
+    def test_execute_deletes_done_task(self):
+        record.delay(1)
+        self.assertTrue(queue.execute(self.claim_one()))
+        self.assertEqual(calls, [1])
+        self.assertFalse(TaskModel.objects.exists())
+
+    def test_retry_delay_doubles_up_to_max(self):
+        self.assertEqual(
+            [queue.retry_delay(attempts) for attempts in (1, 2, 3, 4)],
+            [10, 20, 25, 25],
+        )
+
+    def test_failure_schedules_retry(self):
+        task = fail.delay()
+        before = timezone.now()
+        with self.assertLogs('tasks', 'ERROR'):
+            self.assertFalse(queue.execute(self.claim_one()))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Status.PENDING)
+        self.assertEqual(task.attempts, 1)
+        self.assertEqual(task.locked_by, '')
+        self.assertIsNone(task.locked_at)
+        self.assertIn('task failed', task.last_error)
+        self.assertGreaterEqual(task.run_at, before + timedelta(seconds=10))
+        self.assertEqual(queue.claim(10, 'worker'), [])
+
+        # The next attempt waits twice as long.
+        TaskModel.objects.filter(pk=task.pk).update(run_at=timezone.now())
+        before = timezone.now()
+        with self.assertLogs('tasks', 'ERROR'):
+            queue.execute(self.claim_one())
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 2)
+        self.assertGreaterEqual(task.run_at, before + timedelta(seconds=20))
+
+    def test_failure_after_last_attempt(self):
+        task = fail.delay()
+        TaskModel.objects.filter(pk=task.pk).update(attempts=2)
+        with self.assertLogs('tasks', 'ERROR'):
+            self.assertFalse(queue.execute(self.claim_one()))
+        task.refresh_from_db()
+        self.assertEqual(task.status, Status.FAILED)
+        self.assertEqual(task.attempts, 3)
+        self.assertEqual(queue.claim(10, 'worker'), [])
+
+    def test_release_stale(self):
+        stale = record.delay(1)
+        exhausted = record.delay(2)
+        fresh = record.delay(3)
+        self.assertEqual(len(queue.claim(10, 'dead')), 3)
+        expired = timezone.now() - timedelta(seconds=120)
+        TaskModel.objects.filter(
+            pk__in=(stale.pk, exhausted.pk),
+        ).update(locked_at=expired)
+        TaskModel.objects.filter(pk=exhausted.pk).update(attempts=3)
+
+        self.assertEqual(queue.release_stale(60), 2)
+        stale.refresh_from_db()
+        exhausted.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, Status.PENDING)
+        self.assertEqual(stale.locked_by, '')
+        self.assertIsNone(stale.locked_at)
+        self.assertEqual(stale.attempts, 1)
+        self.assertEqual(exhausted.status, Status.FAILED)
+        self.assertEqual(exhausted.last_error, 'Worker lock expired')
+        self.assertEqual(fresh.status, Status.RUNNING)
+        self.assertEqual(fresh.locked_by, 'dead')
+
+        task = self.claim_one('alive')
+        self.assertEqual(task.pk, stale.pk)
+        self.assertEqual(task.attempts, 2)
+
+
+@override_settings(
+    TASKS_EAGER=False,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class PasswordResetTaskTests(TransactionTestCase):
+    def test_reset_link_is_made_by_worker(self):
+        UserModel.objects.create_user('reader', 'reader@example.com', 'password')
+        self.client.post('/accounts/password/reset/', {'email': 'reader@example.com'})
+        self.assertEqual(len(mail.outbox), 0)
+        task = TaskModel.objects.get()
+        self.assertEqual(task.name, 'accounts.tasks.send_password_reset')
+        self.assertNotIn('/reset/', str(task.args))
+        self.assertNotIn('token', str(task.args))
+
+        self.assertTrue(queue.execute(self.claim()))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        link = next(
+            line.strip()
+            for line in mail.outbox[0].body.splitlines()
+            if '/reset/' in line
+        )
+        response = self.client.get(link[link.index('/accounts/'):], follow=True)
+        self.assertTrue(response.context['validlink'])
+
+    def claim(self):
+        tasks = queue.claim(10)
+        self.assertEqual(len(tasks), 1)
+        return tasks[0]
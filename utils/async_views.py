@@ -0,0 +1,19 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.contrib.auth.mixins import AccessMixin
+
+
+async def aget_user(request):
+    # request.user is a lazy object that loads the session and the user on
+    # first access; resolve it once off the event loop and keep the result.
+    user = await sync_to_async(get_user)(request)
+    request.user = user
+    return user
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    async def dispatch(self, request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
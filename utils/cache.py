@@ -0,0 +1,38 @@
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+
+class ReadOnlyCache(BaseCache):
+    # Reads from the cache alias named by LOCATION and drops every write,
+    # for callers that may use what is stored but must not store anything.
+    def __init__(self, alias, params):
+        super().__init__(params)
+        self.alias = alias
+
+    @property
+    def target(self):
+        return caches[self.alias]
+
+    def get(self, key, default=None, version=None):
+        return self.target.get(key, default, version)
+
+    def get_many(self, keys, version=None):
+        return self.target.get_many(keys, version)
+
+    def has_key(self, key, version=None):
+        return self.target.has_key(key, version)
+
+    def add(self, key, value, timeout=None, version=None):
+        return False
+
+    def set(self, key, value, timeout=None, version=None):
+        pass
+
+    def touch(self, key, timeout=None, version=None):
+        return False
+
+    def delete(self, key, version=None):
+        return False
+
+    def clear(self):
+        pass
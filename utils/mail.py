@@ -0,0 +1,176 @@
+import smtplib
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.mail.backends import smtp
+from django.core.mail.message import sanitize_address
+
+
+def _quit(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+def _dropped(error):
+    # 421 is the server closing the session, e.g. after an idle timeout or
+    # its per-connection message limit.
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError))
+
+
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    # At most `size` authenticated connections per server and account. Idle
+    # ones are reused most recent first, and dropped once they have been idle
+    # for `idle_timeout` seconds or have sent `max_messages` messages.
+    def __init__(self, size, idle_timeout, max_messages):
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.idle = deque()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def acquire(self, connect):
+        self.slots.acquire()
+        try:
+            expired = []
+            pooled = None
+            with self.lock:
+                while self.idle:
+                    candidate = self.idle.pop()
+                    if time.monotonic() - candidate.last_used < self.idle_timeout:
+                        pooled = candidate
+                        break
+                    expired.append(candidate)
+            for candidate in expired:
+                _quit(candidate.connection)
+            return pooled or PooledConnection(connect())
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, pooled, broken=False):
+        try:
+            if broken or pooled.sent >= self.max_messages:
+                if pooled.connection is not None:
+                    _quit(pooled.connection)
+            else:
+                pooled.last_used = time.monotonic()
+                with self.lock:
+                    self.idle.append(pooled)
+        finally:
+            self.slots.release()
+
+    def clear(self):
+        with self.lock:
+            idle, self.idle = self.idle, deque()
+        for pooled in idle:
+            _quit(pooled.connection)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key):
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = SMTPPool(
+                settings.EMAIL_POOL_SIZE,
+                settings.EMAIL_POOL_IDLE_TIMEOUT,
+                settings.EMAIL_POOL_MAX_MESSAGES,
+            )
+        return _pools[key]
+
+
+class PooledEmailBackend(smtp.EmailBackend):
+    # Drop-in SMTP backend that borrows connections from a process-wide pool
+    # instead of opening and logging in for every send_messages() call.
+    # Messages go out in batches of EMAIL_BATCH_SIZE per borrowed connection;
+    # a connection the server dropped is reopened and the message retried.
+    def __init__(self, batch_size=None, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+        self.pool = get_pool((
+            self.host,
+            self.port,
+            self.username,
+            self.use_tls,
+            self.use_ssl,
+        ))
+
+    def open(self):
+        # Connections are opened lazily by the pool.
+        return False
+
+    def close(self):
+        pass
+
+    def connect(self):
+        fail_silently, self.fail_silently = self.fail_silently, False
+        try:
+            super().open()
+            return self.connection
+        finally:
+            self.connection = None
+            self.fail_silently = fail_silently
+
+    def send_messages(self, email_messages):
+        email_messages = [message for message in email_messages if message.recipients()]
+        sent = 0
+        for start in range(0, len(email_messages), self.batch_size):
+            try:
+                sent += self.send_batch(email_messages[start:start + self.batch_size])
+            except (smtplib.SMTPException, OSError):
+                if not self.fail_silently:
+                    raise
+        return sent
+
+    def send_batch(self, email_messages):
+        pooled = self.pool.acquire(self.connect)
+        broken = False
+        sent = 0
+        try:
+            for message in email_messages:
+                if pooled.sent >= self.pool.max_messages:
+                    self.reconnect(pooled)
+                try:
+                    self.deliver(pooled, message)
+                except (smtplib.SMTPException, OSError) as error:
+                    if not _dropped(error):
+                        raise
+                    self.reconnect(pooled)
+                    self.deliver(pooled, message)
+                sent += 1
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self.pool.release(pooled, broken)
+        return sent
+
+    def reconnect(self, pooled):
+        _quit(pooled.connection)
+        pooled.connection = None
+        pooled.connection = self.connect()
+        pooled.sent = 0
+
+    def deliver(self, pooled, message):
+        encoding = message.encoding or settings.DEFAULT_CHARSET
+        pooled.connection.sendmail(
+            sanitize_address(message.from_email, encoding),
+            [sanitize_address(address, encoding) for address in message.recipients()],
+            message.message().as_bytes(linesep='\r\n'),
+        )
+        pooled.sent += 1
@@ -0,0 +1,159 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timezone
+from heapq import merge
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    value = f'{created_at.isoformat()}|{pk}'
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+# Largest value of the 64-bit primary keys the cursors point at.
+MAX_PK = 2 ** 63 - 1
+
+
+def decode_cursor(cursor):
+    # Cursors come from the query string. Anything malformed or out of range
+    # for the database decodes to None, so the request gets the first page
+    # instead of an error at query time.
+    try:
+        value = urlsafe_b64decode(cursor.encode()).decode()
+        created_at, pk = value.split('|')
+        created_at, pk = datetime.fromisoformat(created_at), int(pk)
+        if created_at.tzinfo is not None:
+            # Aware values are stored in UTC, which can overflow the year.
+            created_at.astimezone(timezone.utc)
+    except (binascii.Error, UnicodeError, ValueError, OverflowError):
+        return None
+    if not 0 < pk <= MAX_PK:
+        return None
+    return created_at, pk
+
+
+class KeysetPage:
+    def __init__(self, object_list, params, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.params = params
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def _query(self, name, cursor):
+        params = self.params.copy()
+        params.pop(KeysetPaginator.after_param, None)
+        params.pop(KeysetPaginator.before_param, None)
+        params[name] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query(KeysetPaginator.after_param, self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query(KeysetPaginator.before_param, self.previous_cursor)
+
+
+class KeysetPaginator:
+    # Pages on (date_field, id_field) descending. A cursor is the key of the
+    # edge row of a page, so every page is a bounded range read on that
+    # index no matter how deep the reader has scrolled.
+    after_param = 'after'
+    before_param = 'before'
+
+    def __init__(self, per_page, date_field='created_at', id_field='id'):
+        self.per_page = per_page
+        self.date_field = date_field
+        self.id_field = id_field
+
+    def key(self, obj):
+        return getattr(obj, self.date_field), getattr(obj, self.id_field)
+
+    def cursors(self, params):
+        after = params.get(self.after_param)
+        before = params.get(self.before_param)
+        return (
+            decode_cursor(after) if after else None,
+            decode_cursor(before) if before else None,
+        )
+
+    def _window(self, queryset, params):
+        # Returns the page query and whether its rows come back oldest first.
+        after, before = self.cursors(params)
+        date_field, id_field = self.date_field, self.id_field
+        if before:
+            created_at, pk = before
+            return queryset.filter(
+                Q(**{f'{date_field}__gt': created_at})
+                | Q(**{date_field: created_at, f'{id_field}__gt': pk})
+            ).order_by(date_field, id_field)[:self.per_page + 1], True
+
+        if after:
+            created_at, pk = after
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__lt': created_at})
+                | Q(**{date_field: created_at, f'{id_field}__lt': pk})
+            )
+        return queryset.order_by(
+            f'-{date_field}',
+            f'-{id_field}',
+        )[:self.per_page + 1], False
+
+    def window(self, queryset, params):
+        queryset, backwards = self._window(queryset, params)
+        rows = list(queryset)
+        return rows[::-1] if backwards else rows
+
+    async def awindow(self, queryset, params):
+        queryset, backwards = self._window(queryset, params)
+        rows = [row async for row in queryset]
+        return rows[::-1] if backwards else rows
+
+    def merge(self, windows, params):
+        _, before = self.cursors(params)
+        rows = []
+        for row in merge(*windows, key=self.key, reverse=True):
+            if not rows or self.key(rows[-1]) != self.key(row):
+                rows.append(row)
+        if before:
+            return rows[-(self.per_page + 1):]
+        return rows[:self.per_page + 1]
+
+    def build_page(self, rows, params):
+        after, before = self.cursors(params)
+        has_more = len(rows) > self.per_page
+        if before:
+            rows = rows[1:] if has_more else rows
+            has_next, has_previous = True, has_more
+        else:
+            rows = rows[:self.per_page]
+            has_next, has_previous = has_more, after is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(*self.key(rows[-1]))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(*self.key(rows[0]))
+        return KeysetPage(rows, params, next_cursor, previous_cursor)
+
+    def page(self, queryset, params):
+        return self.build_page(self.window(queryset, params), params)
+
+    async def apage(self, queryset, params):
+        return self.build_page(await self.awindow(queryset, params), params)
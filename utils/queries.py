@@ -0,0 +1,70 @@
+from django.db import connection, connections, router
+from django.db.models.expressions import RawSQL
+
+
+def insert_or_ignore(model, **values):
+    # One INSERT ... ON CONFLICT DO NOTHING. The returned row count tells the
+    # caller whether this statement created the row or a unique constraint
+    # already held it, without a prior SELECT. Routed like an ORM write, so
+    # the router sees it.
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in values]
+    columns = ', '.join(quote(field.column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    params = [
+        field.get_db_prep_save(value, connection)
+        for field, value in zip(fields, values.values())
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+            f'VALUES ({placeholders}) ON CONFLICT DO NOTHING',
+            params,
+        )
+        return cursor.rowcount
+
+
+def delete_where(model, **values):
+    # A single DELETE that bypasses the collector, so delete signals and
+    # cascades are skipped; only use it on tables without dependents.
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in values]
+    conditions = ' AND '.join(f'{quote(field.column)} = %s' for field in fields)
+    params = [
+        field.get_db_prep_value(value, connection)
+        for field, value in zip(fields, values.values())
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {conditions}',
+            params,
+        )
+        return cursor.rowcount
+
+
+def first_pks_per_value(model, field, values, ordering, limit):
+    # Primary keys of the first `limit` rows, by `ordering`, for each value of
+    # `field`, as raw SQL for a pk__in filter. Every value gets its own
+    # LIMIT branch, joined with UNION ALL, so each branch stops after
+    # `limit` entries of an index on (field, *ordering). A correlated
+    # subquery or ROW_NUMBER() would visit every row of the group.
+    quote = connection.ops.quote_name
+    opts = model._meta
+    table = quote(opts.db_table)
+    pk = quote(opts.pk.column)
+    group = opts.get_field(field)
+    order = ', '.join(
+        f'{quote(opts.get_field(name.lstrip("-")).column)} '
+        f'{"DESC" if name.startswith("-") else "ASC"}'
+        for name in ordering
+    )
+    branch = (
+        f'SELECT {pk} FROM (SELECT {pk} FROM {table} '
+        f'WHERE {quote(group.column)} = %s ORDER BY {order} LIMIT %s) AS first_rows'
+    )
+    params = []
+    for value in values:
+        params.extend((group.get_db_prep_value(value, connection), limit))
+    return RawSQL(' UNION ALL '.join([branch] * len(values)), params)
@@ -0,0 +1,63 @@
+import logging
+import os
+from time import perf_counter
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+logger = logging.getLogger('utils.templates')
+
+
+def template_names(include_packages=False):
+    # Every file under the directories the loaders search. Templates shipped
+    # with installed packages (the admin alone has a few hundred) are left out
+    # unless asked for.
+    names = {}
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for loader in engine.engine.template_loaders:
+            loaders = loader.loaders if isinstance(loader, CachedLoader) else [loader]
+            for source in loaders:
+                for directory in source.get_dirs():
+                    directory = str(directory)
+                    if not include_packages and not directory.startswith(str(settings.BASE_DIR)):
+                        continue
+                    for root, _, files in os.walk(directory):
+                        for filename in files:
+                            name = os.path.relpath(os.path.join(root, filename), directory)
+                            names.setdefault(name.replace(os.sep, '/'), engine)
+    return names
+
+
+def warm_templates(include_packages=False):
+    # With the cached loader each engine keeps what get_template() parsed,
+    # including the parents and includes it pulled in, for the process
+    # lifetime.
+    loaded = []
+    errors = {}
+    for name, engine in sorted(template_names(include_packages).items()):
+        try:
+            engine.get_template(name)
+        except (TemplateSyntaxError, UnicodeDecodeError) as error:
+            errors[name] = error
+        else:
+            loaded.append(name)
+    return loaded, errors
+
+
+def warm_up():
+    if not settings.TEMPLATE_WARMUP:
+        return
+    start = perf_counter()
+    loaded, errors = warm_templates()
+    for name, error in errors.items():
+        logger.error('Template %s failed to compile: %s', name, error)
+    logger.info(
+        'Compiled %d templates in %.1fms',
+        len(loaded),
+        (perf_counter() - start) * 1000,
+    )
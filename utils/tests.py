@@ -0,0 +1,314 @@
+import socketserver
+import threading
+import time
+from base64 import urlsafe_b64encode
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User as UserModel
+from django.core.mail import EmailMessage
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import clear_script_prefix, include, path, re_path, reverse, set_script_prefix
+
+from post import urls as post_urls_module
+from post.models import Post as PostModel, post_urls
+from . import mail
+from .pagination import KeysetPaginator, decode_cursor, encode_cursor
+from .urls import url_builder
+
+
+def view(request, **kwargs):
+    pass
+
+
+probe_patterns = [
+    path('item/<int:pk>/<slug:slug>/', view, name='item'),
+    path('{braces}/<str:name>/', view, name='braces'),
+    re_path(r'^code/(?P<code>[a-z]+)/$', view, name='code'),
+]
+
+# Used as ROOT_URLCONF by URLBuilderTests.
+urlpatterns = [
+    path('posts/', include('post.urls')),
+    path('probe/', include((probe_patterns, 'probe'))),
+]
+
+
+def raw_cursor(value):
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        self.assertEqual(
+            decode_cursor(encode_cursor(created_at, 42)),
+            (created_at, 42),
+        )
+
+    def test_invalid_cursors_decode_to_none(self):
+        for cursor in (
+            'not base64!',
+            raw_cursor('no separator'),
+            raw_cursor('2026-01-02T03:04:05+00:00|abc'),
+            raw_cursor('not a date|1'),
+            raw_cursor(f'2026-01-02T03:04:05+00:00|{2 ** 63}'),
+            raw_cursor(f'2026-01-02T03:04:05+00:00|{10 ** 40}'),
+            raw_cursor('2026-01-02T03:04:05+00:00|0'),
+            raw_cursor('2026-01-02T03:04:05+00:00|-1'),
+            raw_cursor('9999-12-31T23:59:59-12:00|1'),
+            raw_cursor('0001-01-01T00:00:00+12:00|1'),
+        ):
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+    def test_out_of_range_cursor_falls_back_to_first_page(self):
+        user = UserModel.objects.create_user('reader', 'reader@example.com', 'pw')
+        posts = [
+            PostModel.objects.create(user=user, caption=f'post {index}', slug=f'post-{index}')
+            for index in range(3)
+        ]
+        paginator = KeysetPaginator(2)
+        first = paginator.page(PostModel.objects.all(), QueryDict())
+        for cursor in (
+            raw_cursor(f'2026-01-02T03:04:05+00:00|{2 ** 64}'),
+            raw_cursor('9999-12-31T23:59:59-12:00|1'),
+        ):
+            with self.subTest(cursor=cursor):
+                params = QueryDict(mutable=True)
+                params['after'] = cursor
+                page = paginator.page(PostModel.objects.all(), params)
+                self.assertEqual(list(page), list(first))
+        self.assertEqual(len(first), 2)
+        self.assertEqual(list(first), posts[:0:-1])
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    # Just enough SMTP for smtplib: no AUTH and no TLS.
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.open += 1
+            server.max_open = max(server.max_open, server.open)
+        try:
+            self.session()
+        finally:
+            with server.lock:
+                server.open -= 1
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def session(self):
+        server = self.server
+        delivered = 0
+        self.reply('220 localhost ESMTP')
+        for line in self.rfile:
+            command = line.decode().strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command.startswith('MAIL'):
+                if server.refuse_after and delivered >= server.refuse_after:
+                    self.reply('421 Too many messages, closing connection')
+                    return
+                self.reply('250 OK')
+            elif command.startswith(('RCPT', 'RSET', 'NOOP')):
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in self.rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    data.append(data_line)
+                time.sleep(server.delay)
+                with server.lock:
+                    server.messages.append(b''.join(data))
+                delivered += 1
+                self.reply('250 Queued')
+                if server.close_after and delivered >= server.close_after:
+                    # Drops the connection without a reply, like an idle
+                    # timeout on the server side.
+                    return
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('500 Unknown command')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, close_after=0, refuse_after=0, delay=0):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.close_after = close_after
+        self.refuse_after = refuse_after
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.open = 0
+        self.max_open = 0
+        self.messages = []
+
+
+@override_settings(
+    EMAIL_POOL_SIZE=2,
+    EMAIL_POOL_IDLE_TIMEOUT=60,
+    EMAIL_POOL_MAX_MESSAGES=100,
+    EMAIL_BATCH_SIZE=20,
+)
+class PooledEmailBackendTests(SimpleTestCase):
+    def start_server(self, **kwargs):
+        server = SMTPServer(**kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def backend(self, server, **kwargs):
+        backend = mail.PooledEmailBackend(
+            host='127.0.0.1',
+            port=server.server_address[1],
+            username='',
+            password='',
+            use_tls=False,
+            use_ssl=False,
+            **kwargs,
+        )
+        self.addCleanup(backend.pool.clear)
+        return backend
+
+    def messages(self, count):
+        return [
+            EmailMessage(f'subject {index}', 'body', 'from@example.com', ['to@example.com'])
+            for index in range(count)
+        ]
+
+    def test_connection_is_reused_across_sends(self):
+        server = self.start_server()
+        for message in self.messages(3):
+            # Every send builds its own backend, as send_mail() does.
+            self.assertEqual(self.backend(server).send_messages([message]), 1)
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 1)
+
+    def test_reconnects_when_server_dropped_idle_connection(self):
+        server = self.start_server(close_after=1)
+        backend = self.backend(server)
+        self.assertEqual(backend.send_messages(self.messages(1)), 1)
+        # The pooled connection is dead by now; the message is retried on a
+        # new one instead of failing.
+        self.assertEqual(backend.send_messages(self.messages(1)), 1)
+        self.assertEqual(len(server.messages), 2)
+        self.assertEqual(server.connections, 2)
+
+    def test_reconnects_after_421(self):
+        server = self.start_server(refuse_after=2)
+        backend = self.backend(server)
+        self.assertEqual(backend.send_messages(self.messages(5)), 5)
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 3)
+
+    @override_settings(EMAIL_POOL_MAX_MESSAGES=2)
+    def test_connection_replaced_after_max_messages(self):
+        server = self.start_server()
+        backend = self.backend(server)
+        self.assertEqual(backend.send_messages(self.messages(5)), 5)
+        self.assertEqual(server.connections, 3)
+
+    def test_pool_size_limits_open_connections(self):
+        server = self.start_server(delay=0.05)
+        sent = []
+
+        def send():
+            sent.append(self.backend(server).send_messages(self.messages(1)))
+
+        threads = [threading.Thread(target=send) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sent, [1] * 8)
+        self.assertEqual(len(server.messages), 8)
+        self.assertLessEqual(server.max_open, 2)
+        self.assertLessEqual(server.connections, 2)
+
+
+class URLBuilderTests(SimpleTestCase):
+    values = {
+        'int': 42,
+        'slug': 'a-slug',
+        'str': 'name',
+    }
+
+    def setUp(self):
+        post_urls.clear()
+        self.addCleanup(post_urls.clear)
+
+    def pattern_args(self, pattern):
+        return [
+            self.values[type(converter).__name__[:-len('Converter')].lower()]
+            for converter in pattern.pattern.converters.values()
+        ]
+
+    def test_matches_reverse_for_every_post_route(self):
+        for pattern in post_urls_module.urlpatterns:
+            args = self.pattern_args(pattern)
+            with self.subTest(name=pattern.name):
+                expected = reverse(f'posts:{pattern.name}', args=args)
+                # The second call is served from the template.
+                self.assertEqual(post_urls.build(pattern.name, *args), expected)
+                self.assertEqual(post_urls.build(pattern.name, *args), expected)
+                self.assertIsNotNone(post_urls.template(pattern.name, len(args)))
+
+    def test_model_urls_match_reverse(self):
+        post = PostModel(pk=7, slug='hello-world')
+        self.assertEqual(post.get_absolute_url(), reverse('posts:post_create'))
+        self.assertEqual(
+            post.detail_absolute_url(),
+            reverse('posts:post_detail', args=(7, 'hello-world')),
+        )
+        self.assertEqual(post.delete_absolute_url(), reverse('posts:post_delete', args=(7,)))
+        self.assertEqual(post.update_absolute_url(), reverse('posts:post_update', args=(7,)))
+        self.assertEqual(post.like_absolute_url(), reverse('posts:post_like', args=(7,)))
+
+    def test_script_prefix(self):
+        post_urls.build('post_like', 1)
+        set_script_prefix('/mounted/')
+        self.addCleanup(clear_script_prefix)
+        self.assertEqual(
+            post_urls.build('post_like', 3),
+            reverse('posts:post_like', args=(3,)),
+        )
+        self.assertTrue(post_urls.build('post_like', 3).startswith('/mounted/'))
+
+    @override_settings(ROOT_URLCONF='utils.tests')
+    def test_probe_routes(self):
+        probe = url_builder('probe')
+        for name, args in (
+            ('item', (5, 'slug-five')),
+            ('braces', ('x',)),
+            ('code', ('abc',)),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    probe.build(name, *args),
+                    reverse(f'probe:{name}', args=args),
+                )
+        # Sentinel digits do not match [a-z]+, so this route keeps reverse().
+        self.assertIsNone(probe.templates[('code', 1)])
+
+    def test_root_urlconf_change_clears_templates(self):
+        post_urls.build('post_like', 1)
+        self.assertTrue(post_urls.templates)
+        with override_settings(ROOT_URLCONF='utils.tests'):
+            self.assertFalse(post_urls.templates)
+            self.assertEqual(
+                post_urls.build('post_like', 1),
+                reverse('posts:post_like', args=(1,)),
+            )
+            self.assertTrue(post_urls.build('post_like', 1).startswith('/posts/'))
@@ -0,0 +1,69 @@
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+
+
+# Digits pass the int, slug, str and path converters alike.
+SENTINEL = 918273645000
+
+
+class URLBuilder:
+    # reverse() walks the resolver and checks every argument against its
+    # converter on each call. A route only changes with the URLconf, so each
+    # name is reversed once with sentinel arguments and turned into a
+    # str.format template; building a URL is then a single format call.
+    # Arguments are not validated, so only pass values reverse() accepts.
+    # Templates follow ROOT_URLCONF; per-request urlconfs are not supported.
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.templates = {}
+
+    def template(self, name, arity):
+        key = (name, arity)
+        try:
+            return self.templates[key]
+        except KeyError:
+            pass
+        sentinels = [str(SENTINEL + index) for index in range(arity)]
+        try:
+            url = reverse(f'{self.namespace}:{name}', args=sentinels)
+        except NoReverseMatch:
+            url = None
+        prefix = get_script_prefix()
+        template = None
+        if (
+            url is not None
+            and url.startswith(prefix)
+            and all(url.count(value) == 1 for value in sentinels)
+        ):
+            template = url[len(prefix):].replace('{', '{{').replace('}', '}}')
+            for index, value in enumerate(sentinels):
+                template = template.replace(value, f'{{{index}}}')
+        # Routes the sentinels cannot stand in for keep using reverse().
+        self.templates[key] = template
+        return template
+
+    def build(self, name, *args):
+        template = self.template(name, len(args))
+        if template is None:
+            return reverse(f'{self.namespace}:{name}', args=args)
+        return get_script_prefix() + template.format(*args)
+
+    def clear(self):
+        self.templates.clear()
+
+
+builders = []
+
+
+def url_builder(namespace):
+    builder = URLBuilder(namespace)
+    builders.append(builder)
+    return builder
+
+
+@receiver(setting_changed)
+def clear_templates(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        for builder in builders:
+            builder.clear()